@@ -0,0 +1,316 @@
+"""
+Autopilot for Snake Game
+
+On boards with a Hamiltonian cycle (an even width or height) the snake
+follows the cycle, which guarantees VICTORY, and cuts across it towards
+the food while it is short enough for the shortcut to be safe. A
+decision only looks at the four neighbouring cells and a few tables
+built once per board, so it stays in the microseconds on 100x100 boards.
+
+Other boards, and boards with walls or obstacles, have no such cycle.
+There the autopilot runs a breadth-first search out from the food, which
+it keeps from tick to tick while the food stays put, growing it by at
+most FIELD_STEP cells a tick until it reaches the head. Moves are ranked
+by their distance to the food (a straight-line guess until the search
+gets there), and the first one that passes a flood fill, checking that
+it does not lead into an area too small for the snake, is taken; if none
+does, the move with the most room is. The flood fill stops at ROOM_LIMIT
+cells, or as soon as it reaches the tail, which will have moved out of
+the way. So a decision costs a few hundred cells at most however big
+the board and the snake are. Both searches reuse preallocated buffers.
+Those rules can lead the snake round the same loop forever, so
+after a board's worth of ticks without food it follows its tail instead,
+picking at random (from a stream seeded by the game) among the moves
+that keep the tail in reach, until it eats again. Food that can only be
+reached by getting stuck (say at the end of a dead-end corridor) is never
+safe, so once even that has not helped for a while it goes for the food
+regardless, which ends the game one way or the other.
+"""
+import random
+from array import array
+
+from constants import BONUS_FOOD_GROWTH
+from ai.hamiltonian import hamiltonian_cycle
+from models.enums import OPPOSITE_DIRECTION
+
+# Shortcuts are only taken while the snake covers less than this share of the board
+SHORTCUT_LIMIT = 0.5
+
+# Cells of slack a shortcut leaves before the tail, on top of any pending growth
+SHORTCUT_MARGIN = BONUS_FOOD_GROWTH + 2
+
+# Boards' worth of ticks without food before the search heads for it even when that is unsafe
+GIVE_UP_AFTER = 4
+
+# Cells the search out from the food grows by per tick
+FIELD_STEP = 100
+
+# Most cells a room check counts before it calls a move safe
+ROOM_LIMIT = 128
+
+class Autopilot:
+    """Chooses the snake's direction each tick.
+    
+    Works like the policies in sim/policies.py: call reset(core) before a
+    game, then core.step(autopilot(core)) on every tick.
+    """
+    name = 'autopilot'
+    
+    def __init__(self, rng=None):
+        self._board = None
+    
+    def reset(self, core):
+        """Prepare for a new game (and build the tables when the board changed)"""
+        if core.board is not self._board:
+            self._build_tables(core.board)
+        self._field_food = None  # The game changed under the search, so start it over
+        # Progress check: the tick the snake last ate (or the game started)
+        self._fed_length = core.snake.length
+        self._fed_tick = core.ticks
+        self._rng = random.Random(core.seed)
+        
+        if self._cycle is not None:
+            # Go round the cycle in whichever direction does not start by reversing the snake
+            snake = core.snake
+            head = snake.head_cell
+            opposite = OPPOSITE_DIRECTION[snake.direction]
+            self._order = self._cycle
+            for direction, cell in self._neighbors[head]:
+                if self._order_distance(head, cell) == 1 and direction == opposite:
+                    self._order = self._reverse_cycle
+                    break
+    
+    def _build_tables(self, board):
+        self._board = board
+        width, height = board.width, board.height
+        cells = board.cells
+        
+        # (direction, neighbour cell) pairs for every cell
+        move_table = board.move_table
+        self._neighbors = [move_table.neighbors(cell) for cell in range(cells)]
+        
+        # Position of every cell along the cycle, in both directions
+        cycle = None
+        if board.open_cells == cells:  # Walls and obstacles would cut the cycle
+            try:
+                cycle = hamiltonian_cycle(width, height)
+            except ValueError:
+                pass
+        if cycle is None:
+            self._cycle = self._reverse_cycle = self._order = None
+        else:
+            self._cycle = array('i', bytes(4 * cells))
+            for i, (x, y) in enumerate(cycle):
+                self._cycle[y * width + x] = i
+            self._reverse_cycle = array('i', ((cells - i) % cells for i in self._cycle))
+            self._order = self._cycle
+        
+        # Search buffers: a cell counts as seen when its stamp matches the current search
+        self._stamp = 0
+        self._seen = array('I', bytes(4 * cells))
+        self._parent = array('i', bytes(4 * cells))  # Cell each cell was reached from
+        self._queue = array('i', bytes(4 * cells))
+        # The search out from the food, kept from tick to tick: cells it has seen, their distance to the food,
+        # and its queue
+        self._field_stamp = 0
+        self._field_seen = array('I', bytes(4 * cells))
+        self._dist = array('i', bytes(4 * cells))
+        self._field_queue = array('i', bytes(4 * cells))
+        self._field_food = None
+        self._field_start = self._field_end = 0
+    
+    def _order_distance(self, start, end):
+        """Steps from one cell to another going forward along the cycle"""
+        return (self._order[end] - self._order[start]) % self._board.cells
+    
+    def __call__(self, core):
+        if core.board is not self._board:
+            self.reset(core)
+        if self._cycle is not None:
+            return self._follow_cycle(core)
+        return self._search(core)
+    
+    def _follow_cycle(self, core):
+        snake = core.snake
+        cells = self._board.cells
+        order = self._order
+        occupied = snake.occupancy
+        head = snake.head_cell
+        position = order[head]
+        
+        # The body always lies on the stretch of the cycle from the tail to the
+        # head (its span, which includes the cells skipped by shortcuts), and the
+        # rest of the cycle is free. A shortcut lengthens the span, and the tail
+        # only catches up on skipped cells over time, so shortcuts are limited
+        # to keep the span within SHORTCUT_LIMIT of the board, growth included.
+        tail_gap = (order[snake.tail_cell] - position) % cells or cells
+        span = cells - tail_gap + 1
+        pending = snake.length - len(snake)
+        food_gap = (order[core.food.cell] - position) % cells
+        limit = min(int(cells * SHORTCUT_LIMIT) - span - pending - SHORTCUT_MARGIN, food_gap)
+        
+        opposite = OPPOSITE_DIRECTION[snake.direction]
+        best = None
+        best_gap = 0
+        for direction, cell in self._neighbors[head]:
+            if direction == opposite or occupied[cell]:
+                continue
+            gap = (order[cell] - position) % cells
+            if (gap == 1 or gap <= limit) and gap > best_gap:
+                best = direction
+                best_gap = gap
+        return best
+    
+    def _next_stamp(self):
+        self._stamp += 1
+        if self._stamp == 0xFFFFFFFF:
+            # Stamps wrapped around; start over with a clean buffer
+            self._seen = array('I', bytes(len(self._seen) * 4))
+            self._stamp = 1
+        return self._stamp
+    
+    def _search(self, core):
+        snake = core.snake
+        occupied = snake.occupancy
+        head = snake.head_cell
+        food = core.food.cell
+        opposite = OPPOSITE_DIRECTION[snake.direction]
+        moves = [(direction, cell) for direction, cell in self._neighbors[head]
+                 if direction != opposite and not occupied[cell]]
+        if not moves:
+            return None
+        
+        if snake.length != self._fed_length:
+            self._fed_length = snake.length
+            self._fed_tick = core.ticks
+        hungry = core.ticks - self._fed_tick
+        room_needed = min(snake.length + BONUS_FOOD_GROWTH, ROOM_LIMIT)
+        if hungry > self._board.cells * GIVE_UP_AFTER:
+            room_needed = 0  # Nothing else has worked, so stop checking for room
+        elif hungry > self._board.cells:
+            # No food for a board's worth of ticks: likely going round a loop
+            return self._follow_tail(snake, head, moves, room_needed)
+        
+        # Steps to the food where the search has got to, and a guess elsewhere
+        self._grow_field(food, occupied, [cell for _, cell in moves])
+        field_seen = self._field_seen
+        field_stamp = self._field_stamp
+        dist = self._dist
+        width = self._board.width
+        height = self._board.height
+        food_x, food_y = food % width, food // width
+        ranked = []
+        for direction, cell in moves:
+            if field_seen[cell] == field_stamp:
+                key = dist[cell]
+            else:
+                dx = abs(cell % width - food_x)
+                dy = abs(cell // width - food_y)
+                if self._board.wrap:
+                    dx = min(dx, width - dx)
+                    dy = min(dy, height - dy)
+                key = self._board.cells + dx + dy
+            ranked.append((key, cell, direction))
+        ranked.sort()
+        if not room_needed:
+            return ranked[0][2]
+        
+        # Take the closest move that leaves enough room to fit the snake (after
+        # eating), or failing that the one with the most room
+        tail = snake.tail_cell
+        best = None
+        best_room = -1
+        for _, cell, direction in ranked:
+            room = self._room(occupied, head, cell, room_needed, tail)
+            if room >= room_needed:
+                return direction
+            if room > best_room:
+                best = direction
+                best_room = room
+        return best
+    
+    def _follow_tail(self, snake, head, moves, room_needed):
+        """Random move that keeps the tail in reach (or enough room), or the one with the most room"""
+        occupied = snake.occupancy
+        tail = snake.tail_cell
+        rooms = [(self._room(occupied, head, cell, room_needed, tail), direction) for direction, cell in moves]
+        safe = [direction for room, direction in rooms if room >= room_needed]
+        if safe:
+            return self._rng.choice(safe)
+        return max(rooms, key=lambda room: room[0])[1]
+    
+    def _grow_field(self, food, occupied, targets):
+        """Carry the breadth-first search out from the food on until it reaches one of targets.
+        
+        The search is kept from tick to tick while the food stays put and
+        grows by at most FIELD_STEP cells per call. Cells it has seen keep
+        their distance to the food; the body only ever frees cells on it,
+        so a path down the distances stays good. If it runs dry without
+        reaching a target (the body was in the way) it starts over.
+        """
+        if food != self._field_food or (
+                self._field_start == self._field_end
+                and all(self._field_seen[cell] != self._field_stamp for cell in targets)):
+            self._field_food = food
+            self._field_stamp += 1
+            if self._field_stamp == 0xFFFFFFFF:
+                self._field_seen = array('I', bytes(len(self._field_seen) * 4))
+                self._field_stamp = 1
+            self._field_seen[food] = self._field_stamp
+            self._dist[food] = 0
+            self._field_queue[0] = food
+            self._field_start = 0
+            self._field_end = 1
+        
+        neighbors = self._neighbors
+        seen = self._field_seen
+        stamp = self._field_stamp
+        dist = self._dist
+        queue = self._field_queue
+        for cell in targets:
+            if seen[cell] == stamp:
+                return
+        start = self._field_start
+        end = self._field_end
+        stop = start + FIELD_STEP
+        found = False
+        while start < end and start < stop and not found:
+            cell = queue[start]
+            start += 1
+            steps = dist[cell] + 1
+            for _, neighbor in neighbors[cell]:
+                if seen[neighbor] != stamp and not occupied[neighbor]:
+                    seen[neighbor] = stamp
+                    dist[neighbor] = steps
+                    queue[end] = neighbor
+                    end += 1
+                    if neighbor in targets:
+                        found = True
+        self._field_start = start
+        self._field_end = end
+    
+    def _room(self, occupied, head, start, limit, tail):
+        """Free cells reachable from start once the head has moved there, counted up to limit.
+        
+        Reaching the tail counts as limit: it moves out of the way in time.
+        """
+        neighbors = self._neighbors
+        seen = self._seen
+        queue = self._queue
+        stamp = self._next_stamp()
+        seen[head] = stamp
+        seen[start] = stamp
+        queue[0] = start
+        end = 1
+        count = 0
+        while count < end and end < limit:
+            cell = queue[count]
+            count += 1
+            for _, neighbor in neighbors[cell]:
+                if seen[neighbor] != stamp and not occupied[neighbor]:
+                    seen[neighbor] = stamp
+                    queue[end] = neighbor
+                    end += 1
+                elif neighbor == tail and tail != head:
+                    return limit
+        return end
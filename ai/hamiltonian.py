@@ -0,0 +1,47 @@
+"""
+Hamiltonian cycles for Snake Game boards
+
+A snake that keeps following a cycle through every cell of the board
+can never run into itself, so it always ends in VICTORY.
+"""
+from models.enums import Direction
+
+def hamiltonian_cycle(width, height):
+    """Cells of a cycle through the whole board; width or height must be even.
+    
+    Row 0 is walked right, the other rows snake back and forth over
+    columns 1.., and column 0 leads back up to the start. With an odd
+    height the same path is built on the transposed board.
+    """
+    if height % 2:
+        if width % 2:
+            raise ValueError(f"No Hamiltonian cycle on a {width}x{height} board")
+        return [(x, y) for y, x in hamiltonian_cycle(height, width)]
+    if width < 2:
+        raise ValueError(f"No Hamiltonian cycle on a {width}x{height} board")
+    
+    cells = []
+    for y in range(height):
+        if y == 0:
+            columns = range(width)
+        elif y % 2:
+            columns = range(width - 1, 0, -1)
+        else:
+            columns = range(1, width)
+        cells.extend((x, y) for x in columns)
+    cells.extend((0, y) for y in range(height - 1, 0, -1))
+    return cells
+
+def cycle_directions(cells):
+    """Direction from each cell of a cycle to the next one"""
+    directions = []
+    for (x, y), (next_x, next_y) in zip(cells, cells[1:] + cells[:1]):
+        if next_x > x:
+            directions.append(Direction.RIGHT)
+        elif next_x < x:
+            directions.append(Direction.LEFT)
+        elif next_y > y:
+            directions.append(Direction.DOWN)
+        else:
+            directions.append(Direction.UP)
+    return directions
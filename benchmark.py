@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for Snake Game
+Measures ops/sec and memory for snake movement, food respawning, autopilot
+decisions, game snapshots, idle games, the high score store and every
+screen, on boards from 10x10 up to 1000x1000.
+Results can be saved as a baseline JSON file, and a later run compared
+against it fails when anything got slower (or bigger) than the threshold.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, GAME_DIR)
+
+# Screens are drawn on SDL's dummy driver, so no display is needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from models.board import Board
+from models.enums import GameState
+from models.food import Food
+from models.free_cells import FreeCellIndex
+from models.snake import Snake
+from ai.autopilot import Autopilot
+from ai.hamiltonian import hamiltonian_cycle, cycle_directions
+from models.core import GameCore
+
+GRID_SIZES = [10, 100, 1000]
+QUICK_GRID_SIZES = [10, 100]
+FILL_LEVELS = [0.1, 0.5, 0.9, 0.99]
+HISTORY_SIZES = [100, 10000]
+AUTOPILOT_GRID_SIZES = [10, 99, 100]  # 99x99 has no Hamiltonian cycle, so it is searched
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown (or growth in memory) before a result counts as a regression
+MEMORY_SLACK = 64 * 1024  # Memory changes below this many bytes are noise
+
+def measure(func, min_time):
+    """Call func until at least min_time has passed; returns calls per second"""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+        calls *= 2 if elapsed < min_time / 10 else 1 + int(min_time / max(elapsed, 1e-9))
+
+def latencies(func, min_time):
+    """Time single calls of func for at least min_time, with the garbage collector off; returns (p99, max) in µs"""
+    times = []
+    clock = time.perf_counter
+    gc.disable()
+    try:
+        end = clock() + min_time
+        while True:
+            start = clock()
+            func()
+            finish = clock()
+            times.append(finish - start)
+            if finish >= end:
+                break
+    finally:
+        gc.enable()
+    times.sort()
+    return times[int(len(times) * 0.99)] * 1e6, times[-1] * 1e6
+
+def traced(build):
+    """Run build() and return (its result, bytes it left allocated)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+class CycleDriver:
+    """Steers a snake around a Hamiltonian cycle, so it never dies"""
+    
+    def __init__(self, snake):
+        self.snake = snake
+        cells = hamiltonian_cycle(snake.board.width, snake.board.height)
+        self.directions = cycle_directions(cells)
+        self.index = cells.index(snake.get_head_position())
+        snake.direction = self.directions[self.index]
+    
+    def step(self):
+        self.snake.change_direction(self.directions[self.index])
+        self.snake.move()
+        self.index = (self.index + 1) % len(self.directions)
+
+def snake_lengths(board):
+    return sorted({1, board.width, board.cells // 2})
+
+def bench_snake(grid_sizes, min_time):
+    results = {}
+    for size in grid_sizes:
+        board = Board(size, size, 0)
+        for length in snake_lengths(board):
+            def build():
+                snake = Snake(board)
+                driver = CycleDriver(snake)
+                snake.length = length
+                for _ in range(length - 1):
+                    driver.step()
+                return driver
+            driver, memory = traced(build)
+            results[f"snake.move/{size}x{size}/length={length}"] = {
+                'ops_per_sec': measure(driver.step, min_time),
+                'memory_bytes': memory,
+            }
+    return results
+
+def bench_food(grid_sizes, min_time):
+    results = {}
+    for size in grid_sizes:
+        board = Board(size, size, 0)
+        for fill in FILL_LEVELS:
+            def build():
+                free_cells = FreeCellIndex(size, size)
+                for cell in range(int(board.cells * fill)):
+                    free_cells.occupy((cell % size, cell // size))
+                return free_cells
+            free_cells, memory = traced(build)
+            food = Food(free_cells, board)
+            results[f"food.respawn/{size}x{size}/fill={int(fill * 100)}%"] = {
+                'ops_per_sec': measure(lambda: food.randomize_position(free_cells), min_time),
+                'memory_bytes': memory,
+            }
+    return results
+
+def bench_autopilot(min_time):
+    results = {}
+    for size in AUTOPILOT_GRID_SIZES:
+        board = Board(size, size, 0)
+        core = GameCore(board, seed=size)
+        autopilot = Autopilot()
+        _, memory = traced(lambda: autopilot.reset(core))  # Builds the per-board tables
+        
+        def tick():
+            # Decide and move; the same game starts over whenever it ends
+            if core.is_over:
+                core.reset(size)
+                autopilot.reset(core)
+            core.step(autopilot(core))
+        
+        ops_per_sec = measure(tick, min_time)
+        # The mean hides slow moves, and a game has to keep up on every tick
+        p99, slowest = latencies(tick, min_time)
+        results[f"autopilot.tick/{size}x{size}"] = {
+            'ops_per_sec': ops_per_sec,
+            'memory_bytes': memory,
+            'p99_us': p99,
+            'max_us': slowest,
+        }
+    return results
+
+def bench_snapshot(grid_sizes, min_time):
+    results = {}
+    for size in grid_sizes:
+        board = Board(size, size, 0)
+        core = GameCore(board, seed=size)
+        # Half the board taken, the snake's worst case for copying
+        driver = CycleDriver(core.snake)
+        core.snake.length = board.cells // 2
+        for _ in range(core.snake.length - 1):
+            driver.step()
+        snapshot, memory = traced(core.snapshot)
+        data = snapshot.to_bytes()
+        
+        for name, func in (
+            ('snapshot', core.snapshot),
+            ('restore', lambda: core.restore(snapshot)),
+            ('fork', core.fork),
+            ('fork_step', lambda: core.fork().step(driver.directions[driver.index])),  # Pays for the copies
+            ('to_bytes', snapshot.to_bytes),
+            ('from_bytes', lambda: snapshot.from_bytes(data, board)),
+        ):
+            results[f"snapshot.{name}/{size}x{size}"] = {
+                'ops_per_sec': measure(func, min_time),
+                'memory_bytes': memory if name == 'snapshot' else len(data) if name == 'to_bytes' else 0,
+            }
+    return results
+
+def bench_memory(grid_sizes, min_time):
+    results = {}
+    for size in grid_sizes:
+        board = Board(size, size, 0)
+        count = max(1, min(1000, 100000 // board.cells))  # Enough games to average out allocator noise
+        for name, build in (
+            ('snake+food', lambda: (lambda snake: (snake, Food(snake.free_cells, board)))(Snake(board))),
+            ('game', lambda: GameCore(board, seed=size)),
+        ):
+            _, memory = traced(lambda: [build() for _ in range(count)])
+            results[f"memory.{name}/{size}x{size}"] = {
+                'ops_per_sec': measure(build, min_time),
+                'memory_bytes': memory // count,  # Per idle game
+            }
+    return results
+
+def bench_highscore(min_time):
+    from utils.highscore import HighScoreManager
+    results = {}
+    directory = tempfile.mkdtemp(prefix='snake-bench-')
+    try:
+        for history in HISTORY_SIZES:
+            filename = os.path.join(directory, f'highscores-{history}.jsonl')
+            manager = HighScoreManager(filename, legacy_filename=None)
+            rng = random.Random(history)
+            for i in range(history):
+                manager.add_score('Player', rng.randrange(1000), rng.random() * 100, i, 0, 'NORMAL')
+            
+            manager, memory = traced(lambda: HighScoreManager(filename, legacy_filename=None))
+            results[f"highscore.load/history={history}"] = {
+                'ops_per_sec': measure(lambda: HighScoreManager(filename, legacy_filename=None), min_time),
+                'memory_bytes': memory,
+            }
+            results[f"highscore.add_score/history={history}"] = {
+                'ops_per_sec': measure(
+                    lambda: manager.add_score('Player', rng.randrange(1000), 12.5, 3, 1, 'NORMAL'), min_time
+                ),
+                'memory_bytes': 0,
+            }
+    finally:
+        shutil.rmtree(directory)
+    return results
+
+def bench_screens(grid_sizes, min_time):
+    import pygame
+    from main import Game
+    from ui import sprites, screens
+    results = {}
+    directory = tempfile.mkdtemp(prefix='snake-bench-')
+    cwd = os.getcwd()
+    os.chdir(directory)  # Keep the high score log and replays out of the repo
+    try:
+        for size in grid_sizes:
+            board = Board(size, size, Board.fit_cell_size(size, size))
+            sprites.clear()
+            screens.clear_layouts()
+            game, memory = traced(lambda: Game(board))
+            game.highscore_manager.add_score('Player', 120, 42.0, 9, 1, 'NORMAL')
+            driver = CycleDriver(game.snake)
+            game.snake.length = min(board.cells // 2, 1000)
+            for _ in range(game.snake.length - 1):
+                driver.step()
+            
+            def draw_game_full():
+                game.board_renderer.invalidate()
+                game.draw_game()
+            
+            def draw_game_tick():
+                driver.step()
+                game.draw_game()
+            
+            def draw_game_over():
+                game.game_state = GameState.GAME_OVER
+                game.draw_game_over()
+            
+            def draw_victory():
+                game.game_state = GameState.VICTORY
+                game.draw_victory()
+            
+            game.countdown_start = time.time()
+            cases = [
+                ('draw_menu', game.draw_menu),
+                ('draw_countdown', game.draw_countdown),
+                ('draw_game_full', draw_game_full),
+                ('draw_game_tick', draw_game_tick),
+                ('draw_game_over', draw_game_over),
+                ('draw_victory', draw_victory),
+                ('draw_highscores', game.draw_highscores),
+                ('display.update', pygame.display.update),
+            ]
+            for name, draw in cases:
+                results[f"screen.{name}/{size}x{size}"] = {
+                    'ops_per_sec': measure(draw, min_time),
+                    'memory_bytes': memory if name == 'draw_menu' else 0,
+                }
+            game.writer.close()
+            pygame.display.quit()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory)
+    return results
+
+SUITES = ['snake', 'food', 'autopilot', 'snapshot', 'memory', 'highscore', 'screens']
+
+def run(suites, grid_sizes, min_time):
+    results = {}
+    for suite in suites:
+        random.seed(0)  # Same food positions on every run
+        if suite == 'snake':
+            results.update(bench_snake(grid_sizes, min_time))
+        elif suite == 'food':
+            results.update(bench_food(grid_sizes, min_time))
+        elif suite == 'autopilot':
+            results.update(bench_autopilot(min_time))
+        elif suite == 'snapshot':
+            results.update(bench_snapshot(grid_sizes, min_time))
+        elif suite == 'memory':
+            results.update(bench_memory(grid_sizes, min_time))
+        elif suite == 'highscore':
+            results.update(bench_highscore(min_time))
+        elif suite == 'screens':
+            results.update(bench_screens(grid_sizes, min_time))
+    return results
+
+def compare(results, baseline, threshold):
+    """Return a description of every result that regressed past the threshold"""
+    regressions = []
+    for name, result in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result['ops_per_sec'] < previous['ops_per_sec'] * (1 - threshold):
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:,.0f} ops/s, baseline {previous['ops_per_sec']:,.0f}"
+            )
+        if 'p99_us' in previous and result['p99_us'] > previous['p99_us'] * (1 + threshold):
+            regressions.append(f"{name}: p99 {result['p99_us']:,.0f} µs, baseline {previous['p99_us']:,.0f}")
+        growth = result['memory_bytes'] - previous['memory_bytes']
+        if growth > MEMORY_SLACK and result['memory_bytes'] > previous['memory_bytes'] * (1 + threshold):
+            regressions.append(
+                f"{name}: {result['memory_bytes']:,} bytes, baseline {previous['memory_bytes']:,}"
+            )
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Snake Game benchmarks')
+    parser.add_argument('suites', nargs='*', metavar='SUITE',
+                        help=f"suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument('--quick', action='store_true', help='skip the 1000x1000 board')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds spent measuring each case')
+    parser.add_argument('--save', metavar='FILE', help='write the results as a baseline JSON file')
+    parser.add_argument('--baseline', metavar='FILE', help='fail if results regressed against this file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed relative regression (default %(default)s)')
+    args = parser.parse_args(argv)
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error(f"unknown suite {suite!r}, choose from {', '.join(SUITES)}")
+    
+    grid_sizes = QUICK_GRID_SIZES if args.quick else GRID_SIZES
+    results = run(args.suites or SUITES, grid_sizes, args.min_time)
+    
+    for name, result in results.items():
+        line = f"{name:<45} {result['ops_per_sec']:>14,.0f} ops/s {result['memory_bytes'] / 1024:>10,.1f} KiB"
+        if 'p99_us' in result:
+            line += f"  p99 {result['p99_us']:,.0f} µs, max {result['max_us']:,.0f} µs"
+        print(line)
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} results to {args.save}")
+    
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) past {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions past {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,9 @@
 """
 Constants and configuration for Snake Game
-"""
-import pygame
 
-# Initialize pygame
-pygame.init()
+This module has no side effects: pygame is neither imported nor
+initialized here, so the game logic can be used without it.
+"""
 
 # Screen dimensions
 SCREEN_WIDTH = 400  # Reduced screen size for 10x10 grid
@@ -12,9 +11,23 @@ SCREEN_HEIGHT = 400
 GRID_SIZE = 40  # Increased grid size to make each cell 40x40 pixels
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE  # 10 cells wide
 GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE  # 10 cells high
+MAX_SCREEN_SIZE = 1000  # Larger boards get smaller cells to fit on screen
+MIN_DETAIL_SIZE = 4  # Cells smaller than this are drawn without grid lines or borders
 
 # Game speed
 BASE_SNAKE_SPEED = 10  # Lower is slower
+RENDER_FPS = 60  # How often input is polled and the screen may be redrawn
+MAX_UPDATES_PER_FRAME = 5  # Catch-up limit for the fixed-timestep loop
+INPUT_BUFFER_SIZE = 3  # Turns that can be queued ahead; one is applied per move
+
+# Profiling (off unless enabled with --profile or SNAKE_PROFILE=1)
+PROFILE_SAMPLES = 600  # Timings kept per phase, 10s of frames at RENDER_FPS
+PROFILE_DUMP_INTERVAL = 5.0  # Seconds between dumps to the profile output file
+PROFILE_FONT_SIZE = 14
+
+# Food
+BONUS_FOOD_CHANCE = 0.3  # Chance that the next food is a bonus
+BONUS_FOOD_GROWTH = 3  # Segments gained from bonus food (regular food gives 1)
 
 # Colors
 WHITE = (255, 255, 255)
@@ -30,14 +43,29 @@ LIGHT_RED = (255, 100, 100)
 PURPLE = (128, 0, 128)
 LIGHT_PURPLE = (200, 100, 200)
 GOLD = (255, 215, 0)
+BROWN = (139, 69, 19)  # Color for obstacles (walls are GRAY)
+
+# High score files
+HIGHSCORE_FILE = "highscores.json"  # Legacy format, imported once into the log
+HIGHSCORE_LOG = "highscores.jsonl"  # Append-only log of every finished game
+HIGHSCORE_LIMIT = 10  # Entries per leaderboard
+WRITE_QUEUE_SIZE = 64  # Scores and replays waiting for the background writer
 
-# High score file
-HIGHSCORE_FILE = "highscores.json"
+# Replays of finished games are saved here
+REPLAY_DIR = "replays"
 
-# Fonts
-FONT = pygame.font.SysFont('Arial', 24)
-SMALL_FONT = pygame.font.SysFont('Arial', 18)
-BIG_FONT = pygame.font.SysFont('Arial', 48)
+# Network play (net/server.py and net/client.py)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+MAX_NET_BOARD_SIZE = 200  # Largest board width or height a client may ask for
+NET_WRITE_LIMIT = 64 * 1024  # Unsent bytes allowed per client before it is dropped as too slow
+NET_JOIN_TIMEOUT = 10.0  # Seconds a new connection has to ask for a match
+
+# Fonts (created on first use by ui.text.get_font)
+FONT_NAME = 'Arial'
+FONT_SIZE = 24
+SMALL_FONT_SIZE = 18
+BIG_FONT_SIZE = 48
 
 # Button dimensions
 BUTTON_WIDTH = 120
@@ -46,3 +74,14 @@ BUTTON_MARGIN = 20
 
 # Countdown settings
 COUNTDOWN_DURATION = 2  # seconds
+
+
+_LAZY_FONTS = {'FONT': FONT_SIZE, 'SMALL_FONT': SMALL_FONT_SIZE, 'BIG_FONT': BIG_FONT_SIZE}
+
+def __getattr__(name):
+    # FONT, SMALL_FONT and BIG_FONT used to be created at import time; they
+    # are still available, but only load pygame's font module when asked for
+    if name in _LAZY_FONTS:
+        from ui.text import get_font
+        return get_font(_LAZY_FONTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,19 +1,327 @@
 #!/usr/bin/env python3
 """
 Headless test for Snake Game
-This script will run the game for a few seconds and then exit
+This script checks that the game logic imports quickly without pygame,
+that replays and snapshots round-trip and re-simulate their games, that
+the batch engine follows GameCore's rules, that damaged level files and
+high score log lines are rejected, and that the board renderer's
+incremental frames match full redraws, then runs the game for a few
+seconds and exits
 """
+import json
 import os
+import random
 import sys
 import time
-import pygame
 import signal
+import subprocess
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Maximum time to import the game logic in a fresh interpreter
+IMPORT_BUDGET = 0.2  # seconds
+
+def check_import_budget():
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "from models.core import GameCore\n"
+        "GameCore().step()\n"
+        "print(time.perf_counter() - start, 'pygame' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=GAME_DIR, capture_output=True, text=True, check=True
+    )
+    elapsed, pygame_loaded = result.stdout.split()
+    elapsed = float(elapsed)
+    
+    print(f"Game logic imported and stepped in {elapsed * 1000:.1f}ms")
+    if pygame_loaded == 'True':
+        print("Test failed: importing the game logic loaded pygame")
+        sys.exit(1)
+    if elapsed > IMPORT_BUDGET:
+        print(f"Test failed: import took longer than {IMPORT_BUDGET * 1000:.0f}ms")
+        sys.exit(1)
+
+check_import_budget()
+
+def fail(message):
+    print(f"Test failed: {message}")
+    sys.exit(1)
+
+def check_replays():
+    from models.board import Board
+    from models.core import GameCore
+    from models.enums import Direction
+    from sim.policies import GreedyPolicy
+    from utils.replay import Replay, ReplayPlayer
+    
+    # Run lengths on either side of the varint byte boundaries (length << 2 | code
+    # fits one byte below 128 and two below 16384), with the bytes each should take
+    runs = [(1, 1), (31, 1), (32, 2), (127, 2), (128, 2), (4095, 2), (4096, 3), (70000, 3)]
+    replay = Replay(2**64 - 1, 7, 9)
+    header_size = len(replay.to_bytes())
+    for (length, _), direction in zip(runs, list(Direction) * 2):
+        for _ in range(length):
+            replay.record(direction)
+    data = replay.to_bytes()
+    copy = Replay.from_bytes(data)
+    if (copy.seed, copy.width, copy.height, copy.ticks, copy.runs) != (
+        replay.seed, replay.width, replay.height, sum(length for length, _ in runs), replay.runs
+    ):
+        fail("replay did not survive to_bytes()/from_bytes()")
+    if len(data) != header_size + sum(size for _, size in runs):
+        fail(f"replay runs took {len(data) - header_size} bytes")
+    for bad in (data[:-1], data[:10], b'XXXX' + data[4:]):
+        try:
+            Replay.from_bytes(bad)
+        except ValueError:
+            continue
+        fail("a damaged replay was accepted")
+    
+    # A recorded game re-simulates to the same result
+    board = Board(12, 12, 0)
+    core = GameCore(board, seed=2024)
+    replay = Replay.for_core(core)
+    policy = GreedyPolicy(random.Random(7))
+    while not core.is_over:
+        core.step(policy(core))
+        replay.record(core.snake.direction)
+    played = ReplayPlayer(Replay.from_bytes(replay.to_bytes()), board).run()
+    if (played.state, played.ticks, played.snake.score) != (core.state, core.ticks, core.snake.score):
+        fail("replay did not re-simulate to the recorded game")
+    print(f"Replay re-simulated {core.ticks} ticks to score {core.snake.score}")
+
+check_replays()
+
+def check_snapshots():
+    from models.board import Board
+    from models.core import GameCore
+    from models.level import generate
+    from models.snapshot import GameSnapshot
+    from sim.policies import GreedyPolicy, RandomPolicy
+    
+    # Big enough boards share their arrays with forks, so 64x64 covers both ways of forking
+    boards = [
+        Board(10, 10, 0),
+        Board(64, 64, 0, wrap=True),
+        Board(40, 30, 0, level=generate(40, 30, 0.05, seed=1)),
+    ]
+    for board in boards:
+        core = GameCore(board, seed=11)
+        policy = GreedyPolicy(random.Random(3))
+        for _ in range(100):
+            core.step(policy(core))
+        data = core.snapshot().to_bytes()
+        if GameSnapshot.from_bytes(data, board).to_bytes() != data:
+            fail(f"snapshot did not survive to_bytes()/from_bytes() on {board.key}")
+        
+        # The original, a fork and a game rebuilt from bytes play on identically,
+        # whatever another fork of the same game does in the meantime
+        rival = core.fork()
+        rival_policy = RandomPolicy(random.Random(9))
+        games = [core, core.fork(), GameCore.from_snapshot(GameSnapshot.from_bytes(data, board))]
+        policies = [GreedyPolicy(random.Random(5)) for _ in games]
+        while not core.is_over and core.ticks < 2000:
+            rival.step(rival_policy(rival))
+            for game, policy in zip(games, policies):
+                game.step(policy(game))
+            states = {game.snapshot().to_bytes() for game in games}
+            if len(states) != 1:
+                fail(f"forked games drifted apart at tick {core.ticks} on {board.key}")
+        print(f"Forks played on alike on {board.key} to tick {core.ticks}, score {core.snake.score}")
+
+check_snapshots()
+
+def check_batch_rules():
+    from ai.autopilot import Autopilot
+    from models.board import Board
+    from models.core import GameCore
+    from models.enums import Direction, GameState
+    from sim.batch import BatchSnakeGame, PLAYING, GAME_OVER, VICTORY
+    from sim.policies import GreedyPolicy
+    
+    # The batch engine and GameCore draw food from different random streams,
+    # so the batch's food is set to GameCore's after every tick; everything
+    # else (turns, moves, collisions, growth, victory) must then agree
+    status = {GameState.PLAYING: PLAYING, GameState.GAME_OVER: GAME_OVER, GameState.VICTORY: VICTORY}
+    endings = set()
+    for width, height in [(6, 4), (5, 5)]:
+        board = Board(width, height, 0)
+        cores = [GameCore(board, seed, bonus_chance=0.3) for seed in range(12)]
+        policies = []
+        for i, core in enumerate(cores):
+            if i % 3 == 0:
+                policy = Autopilot()
+                policy.reset(core)
+            elif i % 3 == 1:
+                policy = GreedyPolicy(random.Random(i))
+            else:
+                # Any input at all, including none and straight back
+                policy = lambda core, rng=random.Random(i): rng.choice([None, *Direction])
+            policies.append(policy)
+        batch = BatchSnakeGame(len(cores), width, height, seed=0)
+        
+        def sync_food():
+            for i, core in enumerate(cores):
+                batch.food[i] = core.food.cell
+                batch.food_is_bonus[i] = core.food.is_bonus
+        
+        sync_food()
+        while not all(core.is_over for core in cores):
+            actions = [0] * len(cores)
+            for i, (core, policy) in enumerate(zip(cores, policies)):
+                if not core.is_over:
+                    action = policy(core)
+                    actions[i] = 0 if action is None else action.value
+                    core.step(action)
+            batch.step(actions)
+            for i, core in enumerate(cores):
+                snake = core.snake
+                expected = (status[core.state], core.ticks, snake.score, snake.length, snake.positions)
+                actual = (batch.status[i], batch.ticks[i], batch.score[i], batch.length[i], batch.positions(i))
+                if expected != actual:
+                    fail(f"batch game {i} on {width}x{height} differs from GameCore at tick {core.ticks}")
+            sync_food()
+        endings.update(core.state.name for core in cores)
+    print(f"Batch engine matched GameCore step by step ({', '.join(sorted(endings))})")
+
+check_batch_rules()
+
+def check_levels():
+    import struct
+    import tempfile
+    from models.level import Level, MAGIC, VERSION, EMPTY, BODY, WALL, OBSTACLE, FOOD
+    
+    def level_bytes(cells, width=5, height=4, start=(2, 2), magic=MAGIC, version=VERSION):
+        return struct.pack('<4sBBHHHH', magic, version, 0, width, height, *start) + bytes(cells)
+    
+    cells = [WALL] * 5 + [WALL, EMPTY, FOOD, OBSTACLE, WALL] + [WALL, EMPTY, EMPTY, EMPTY, WALL] + [WALL] * 5
+    level = Level.from_bytes(level_bytes(cells))
+    if (level.food, level.start, level.open_cells) != (7, (2, 2), 5):
+        fail("level file was not read back as written")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'test.snkl')
+        level.save(filename)
+        if Level.load(filename).to_bytes() != level.to_bytes():
+            fail("level did not survive save()/load()")
+    no_food = list(cells)
+    no_food[7] = EMPTY
+    if Level.from_bytes(level_bytes(no_food)).food is not None:
+        fail("a level without food should leave the first food to chance")
+    
+    def replace(index, value):
+        changed = list(cells)
+        changed[index] = value
+        return changed
+    
+    bad_levels = {
+        'bad magic': level_bytes(cells, magic=b'SNKR'),
+        'unsupported version': level_bytes(cells, version=VERSION + 1),
+        'truncated header': level_bytes(cells)[:10],
+        'missing cells': level_bytes(cells)[:-1],
+        'extra cells': level_bytes(cells + [EMPTY]),
+        'size mismatch': level_bytes(cells, width=4, height=5)[:-2],
+        'empty level': level_bytes([], width=0, height=0),
+        'unknown cell code': level_bytes(replace(6, 9)),
+        'body cell': level_bytes(replace(6, BODY)),
+        'duplicate food': level_bytes(replace(13, FOOD)),
+        'start on a wall': level_bytes(cells, start=(0, 0)),
+        'start on an obstacle': level_bytes(cells, start=(3, 1)),
+        'start on the food': level_bytes(cells, start=(2, 1)),
+        'start off the level': level_bytes(cells, start=(5, 2)),
+    }
+    for name, data in bad_levels.items():
+        try:
+            Level.from_bytes(data)
+        except ValueError:
+            continue
+        fail(f"level with {name} was accepted")
+    print(f"Level files: {len(bad_levels)} kinds of damage rejected")
+
+check_levels()
+
+def check_highscores():
+    import tempfile
+    from utils.highscore import HighScoreManager
+    
+    good = [
+        {'name': 'A', 'score': 30, 'time_played': 12.5, 'difficulty': 'NORMAL'},
+        {'name': 'B', 'score': 50, 'time_played': 20, 'difficulty': 'HARD', 'board': '20x20'},
+        {'name': 'C', 'score': 10},
+    ]
+    bad = [
+        '[1, 2]',
+        '{"name": "D"}',
+        '{"score": "x"}',
+        '{"score": true}',
+        '{"score": 40, "time_played": "12s"}',
+        '{"score": 40, "difficulty": 2}',
+        '{"score": 40, "board": ["10x10"]}',
+    ]
+    torn = '{"name": "E", "sco'  # A write cut off by a crash, without its newline
+    lines = [json.dumps(entry) for entry in good] + bad
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'scores.jsonl')
+        with open(filename, 'w') as f:
+            f.write('\n'.join(lines) + '\n' + torn)
+        
+        scores = HighScoreManager(filename, legacy_filename=None)
+        if len(scores) != len(good) or scores.corrupt_lines != len(bad) + 1:
+            fail(f"high score log loaded {len(scores)} scores and {scores.corrupt_lines} damaged lines")
+        if [entry['name'] for entry in scores.get_highscores()] != ['A', 'C']:
+            fail("high score log lost a valid entry")
+        
+        # The damaged lines were compacted away, so a new score starts on a line of its own
+        scores.add_score('F', 20, 5, 2, 0, 'NORMAL')
+        scores = HighScoreManager(filename, legacy_filename=None)
+        if len(scores) != len(good) + 1 or scores.corrupt_lines:
+            fail(f"high score log reloaded {len(scores)} scores and {scores.corrupt_lines} damaged lines")
+    print(f"High score log: {len(bad) + 1} damaged lines dropped, {len(good) + 1} scores kept")
+
+check_highscores()
+
+import pygame
 
 # Set up display
 os.environ['SDL_VIDEODRIVER'] = 'dummy'
 pygame.init()
 pygame.display.set_mode((800, 600))
 
+def check_renderer():
+    from ai.autopilot import Autopilot
+    from constants import FONT_SIZE, SMALL_FONT_SIZE
+    from models.board import Board
+    from models.core import GameCore
+    from models.enums import Difficulty
+    from ui.renderer import BoardRenderer
+    from ui.text import get_font
+    
+    # Every incremental frame of a few won games must match a full redraw
+    board = Board(10, 10, 20)
+    fonts = (get_font(FONT_SIZE), get_font(SMALL_FONT_SIZE))
+    size = (board.width * board.cell_size, board.height * board.cell_size)
+    frames = 0
+    for seed in range(4):
+        core = GameCore(board, seed)
+        autopilot = Autopilot()
+        autopilot.reset(core)
+        renderer = BoardRenderer(pygame.Surface(size), *fonts, board)
+        while True:
+            state = (core.snake, core.food, core.snake.score, core.ticks, Difficulty.NORMAL)
+            renderer.draw(*state)
+            full = BoardRenderer(pygame.Surface(size), *fonts, board)
+            full.draw(*state)
+            if pygame.image.tobytes(renderer.board, 'RGB') != pygame.image.tobytes(full.board, 'RGB'):
+                fail(f"incremental frame at tick {core.ticks} of game {seed} differs from a full redraw")
+            frames += 1
+            if core.is_over:
+                break
+            core.step(autopilot(core))
+    print(f"Board renderer: {frames} incremental frames match full redraws")
+
+check_renderer()
+
 print("Snake Game is running in headless mode...")
 print("This is a test to verify the game works on your EC2 instance")
 print("The game will exit automatically after 5 seconds")
@@ -27,19 +335,19 @@ signal.signal(signal.SIGALRM, exit_game)
 signal.alarm(5)
 
 # Import and run the game in a way that we can control
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from main import Snake, Food, GRID_SIZE, GRID_WIDTH, GRID_HEIGHT, Direction
+sys.path.append(GAME_DIR)
+from models.core import GameCore
 
 # Create game objects
-snake = Snake()
-food = Food()
+core = GameCore()
+snake = core.snake
 
 # Run a few game cycles
 for _ in range(50):
-    snake.move()
-    if snake.get_head_position() == food.position:
-        snake.grow()
-        food.randomize_position()
+    core.step()
+    if core.is_over:
+        print(f"Game ended at tick {core.ticks}: {core.state.name}")
+        break
     
     # Print some game state
     print(f"Snake position: {snake.get_head_position()}, Length: {snake.length}, Score: {snake.score}")
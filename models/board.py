@@ -0,0 +1,139 @@
+"""
+Board configuration for Snake Game
+"""
+import os
+from constants import GRID_WIDTH, GRID_HEIGHT, GRID_SIZE, MAX_SCREEN_SIZE
+from models.moves import move_table
+
+class Board:
+    """Board dimensions in cells, plus the pixel size of one cell.
+    
+    A cell size of 0 means headless: the game logic runs without a window.
+    On a wrap-around board the snake leaves through one edge and comes back
+    in on the opposite one. A Level adds walls and obstacles.
+    """
+    
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, cell_size=GRID_SIZE, wrap=False, level=None):
+        if width < 1 or height < 1:
+            raise ValueError(f"Board must be at least 1x1, got {width}x{height}")
+        if cell_size < 0:
+            raise ValueError(f"Cell size must not be negative, got {cell_size}")
+        if level is not None and (level.width, level.height) != (width, height):
+            raise ValueError(f"Level is {level.width}x{level.height}, not {width}x{height}")
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.wrap = wrap or (level is not None and level.wrap)
+        self.level = level
+    
+    def __repr__(self):
+        extra = ', wrap=True' if self.wrap else ''
+        if self.level is not None:
+            extra += ', level=...'
+        return f"Board({self.width}, {self.height}, cell_size={self.cell_size}{extra})"
+    
+    @property
+    def cells(self):
+        return self.width * self.height
+    
+    @property
+    def open_cells(self):
+        """Cells the snake can ever occupy: all of them, less the level's walls and obstacles"""
+        return self.cells if self.level is None else self.level.open_cells
+    
+    @property
+    def center(self):
+        return (self.width // 2, self.height // 2)
+    
+    @property
+    def start(self):
+        """Cell the snake starts on"""
+        return self.center if self.level is None else self.level.start
+    
+    @property
+    def level_digest(self):
+        """The level's digest, or None without a level"""
+        return None if self.level is None else self.level.digest
+    
+    @property
+    def key(self):
+        """Size and mode as a short string, e.g. '20x20' or '40x30/wrap/level-<digest>'"""
+        key = f"{self.width}x{self.height}"
+        if self.wrap:
+            key += '/wrap'
+        if self.level is not None:
+            key += f"/level-{self.level.digest.hex()}"
+        return key
+    
+    def check(self, width, height, wrap, level_digest, what):
+        """Raise ValueError unless this board has the size and mode something was recorded on"""
+        if (self.width, self.height) != (width, height):
+            raise ValueError(f"{what} is for a {width}x{height} board, not {self.width}x{self.height}")
+        if self.wrap != wrap:
+            raise ValueError(f"{what} is for a board {'with' if wrap else 'without'} wrap-around")
+        if self.level_digest != level_digest:
+            if level_digest is None:
+                raise ValueError(f"{what} is for a board without a level")
+            if self.level is None:
+                raise ValueError(f"{what} is for a level, which has to be given")
+            raise ValueError(f"{what} is for a different level")
+    
+    @property
+    def move_table(self):
+        """Shared MoveTable for this board's size and edges"""
+        return move_table(self.width, self.height, self.wrap)  # The module function, not this property
+    
+    def new_grid(self):
+        """A game's typed cell grid at the start (see models/level.py): empty, or the level's"""
+        return bytearray(self.cells) if self.level is None else self.level.new_grid()
+    
+    @property
+    def headless(self):
+        return self.cell_size == 0
+    
+    @property
+    def screen_width(self):
+        return self.width * self.cell_size
+    
+    @property
+    def screen_height(self):
+        return self.height * self.cell_size
+    
+    def contains(self, position):
+        x, y = position
+        return 0 <= x < self.width and 0 <= y < self.height
+    
+    @staticmethod
+    def fit_cell_size(width, height):
+        """Largest cell size up to GRID_SIZE that keeps the window within MAX_SCREEN_SIZE"""
+        return max(1, min(GRID_SIZE, MAX_SCREEN_SIZE // max(width, height)))
+    
+    @classmethod
+    def from_settings(cls, width=None, height=None, cell_size=None, environ=os.environ, wrap=False, level=None):
+        """Build a board from explicit settings, falling back to environment variables.
+        
+        SNAKE_GRID_WIDTH, SNAKE_GRID_HEIGHT and SNAKE_CELL_SIZE are read for
+        any value not given. Without a cell size, one that fits the screen
+        is chosen. A level sets the board's size.
+        """
+        if level is not None:
+            width, height = level.width, level.height
+        if width is None:
+            width = int(environ.get('SNAKE_GRID_WIDTH', GRID_WIDTH))
+        if height is None:
+            height = int(environ.get('SNAKE_GRID_HEIGHT', GRID_HEIGHT))
+        if cell_size is None:
+            if 'SNAKE_CELL_SIZE' in environ:
+                cell_size = int(environ['SNAKE_CELL_SIZE'])
+            else:
+                cell_size = cls.fit_cell_size(width, height)
+        return cls(width, height, cell_size, wrap, level)
+
+
+def cell_typecode(cells):
+    """Smallest array typecode that holds every cell index of a board"""
+    return 'H' if cells <= 0x10000 else 'I'
+
+
+# The classic 10x10 board
+DEFAULT_BOARD = Board()
@@ -0,0 +1,202 @@
+"""
+Game rules for Snake Game
+
+GameCore owns everything needed to play one game (board, snake, food
+and a tick counter) and advances it with step(). It never reads the
+clock, touches the disk or imports pygame: time is counted in ticks and
+all randomness comes from a per-game random stream seeded with ``seed``,
+so the same seed and inputs always replay the same game.
+"""
+import random
+
+from constants import BASE_SNAKE_SPEED, BONUS_FOOD_CHANCE, BONUS_FOOD_GROWTH
+from models.board import DEFAULT_BOARD, cell_typecode
+from models.enums import GameState, GameEvent, Difficulty
+from models.snake import Snake
+from models.food import Food
+from models.snapshot import GameSnapshot
+
+SEED_BITS = 64  # Seeds are unsigned 64-bit integers, as stored in replays
+
+def snake_speed(difficulty):
+    """Moves per second at a difficulty"""
+    if difficulty == Difficulty.EASY:
+        return BASE_SNAKE_SPEED * 0.4  # 60% slower than hard
+    elif difficulty == Difficulty.NORMAL:
+        return BASE_SNAKE_SPEED * 0.7  # 30% slower than hard
+    else:  # HARD
+        return BASE_SNAKE_SPEED
+
+class GameCore:
+    def __init__(self, board=DEFAULT_BOARD, seed=None, bonus_chance=BONUS_FOOD_CHANCE):
+        self.board = board
+        self.bonus_chance = bonus_chance  # Chance that the next food is a bonus
+        self.reset(seed)
+    
+    def reset(self, seed=None):
+        """Start a new game; without a seed a fresh one is picked"""
+        if seed is None:
+            seed = random.getrandbits(SEED_BITS)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.snake = Snake(self.board)
+        self.food = Food(self.snake.free_cells, self.board, self.rng)
+        self.state = GameState.PLAYING
+        self.ticks = 0  # Steps taken so far; the game's only notion of time
+        self.max_possible_score = self.board.open_cells - 1  # Maximum cells minus starting snake
+        self._rng_state = None  # State of rng as of the last snapshot, until rng is used again
+    
+    @classmethod
+    def from_snapshot(cls, snapshot, bonus_chance=BONUS_FOOD_CHANCE):
+        """New game that plays on from a snapshot"""
+        core = cls.__new__(cls)
+        board = core.board = snapshot.board
+        core.bonus_chance = bonus_chance
+        core._rng = None
+        core.snake = Snake.__new__(Snake)
+        core.snake.board = board
+        core.food = Food.__new__(Food)
+        core.food.board = board
+        core.max_possible_score = board.open_cells - 1
+        core.restore(snapshot)
+        return core
+    
+    def snapshot(self):
+        """Capture the game's state as a GameSnapshot"""
+        if self._rng_state is None:
+            self._rng_state = self._rng.getstate()
+        snake = self.snake
+        return GameSnapshot(
+            board=self.board, body=snake.cells(cell_typecode(self.board.cells)),
+            occupancy=bytes(snake.occupancy), free_cells=snake.free_cells.copy(),
+            direction=snake.direction, length=snake.length, score=snake.score,
+            regular_food_eaten=snake.regular_food_eaten, bonus_food_eaten=snake.bonus_food_eaten,
+            is_alive=snake.is_alive, moves=snake.moves,
+            food=self.food.cell, food_is_bonus=self.food.is_bonus,
+            state=self.state, ticks=self.ticks, seed=self.seed, rng_state=self._rng_state,
+        )
+    
+    def restore(self, snapshot):
+        """Rewind (or fast-forward) the game to a snapshot taken on a board of the same size and mode"""
+        board = snapshot.board
+        if board is not self.board:
+            self.board.check(board.width, board.height, board.wrap, board.level_digest, "Snapshot")
+        self.snake.restore(snapshot)
+        self.food.cell = snapshot.food
+        self.food.is_bonus = snapshot.food_is_bonus
+        self.state = snapshot.state
+        self.ticks = snapshot.ticks
+        self.seed = snapshot.seed
+        self._rng = None  # Rebuilt from the snapshot's state when food is next eaten
+        self._rng_state = snapshot.rng_state
+    
+    def fork(self):
+        """Independent copy of the game, which then plays on separately.
+        
+        On big boards the snake's body, grid and free cells are shared
+        until either game moves, and the random stream is only rebuilt when the
+        fork first eats, so forking costs the same at any board size.
+        """
+        if self._rng_state is None:
+            self._rng_state = self._rng.getstate()
+        core = GameCore.__new__(GameCore)
+        core.board = self.board
+        core.bonus_chance = self.bonus_chance
+        core.snake = self.snake.fork()
+        core.food = self.food.copy()
+        core.state = self.state
+        core.ticks = self.ticks
+        core.seed = self.seed
+        core.max_possible_score = self.max_possible_score
+        core._rng = None
+        core._rng_state = self._rng_state
+        return core
+    
+    @property
+    def rng(self):
+        """The game's random stream"""
+        if self._rng is None:
+            # Forks and restored games only build their stream once it is needed;
+            # setstate() fills it in, so it is created without seeding
+            self._rng = random.Random.__new__(random.Random)
+            self._rng.setstate(self._rng_state)
+        return self._rng
+    
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
+    
+    @property
+    def is_over(self):
+        return self.state != GameState.PLAYING
+    
+    def check_victory(self):
+        # Victory condition: snake length equals maximum possible length
+        return self.snake.length >= self.max_possible_score
+    
+    def step(self, action=None, rng=None):
+        """Advance the game by one tick and return the list of GameEvents it caused.
+        
+        action is an optional Direction to turn to before moving. rng
+        overrides the core's own random source for this step.
+        """
+        if self.state != GameState.PLAYING:
+            return []
+        
+        snake = self.snake
+        food = self.food
+        if action is not None:
+            snake.change_direction(action)
+        
+        snake.move()
+        self.ticks += 1
+        
+        # Check if snake is still alive
+        if not snake.is_alive:
+            self.state = GameState.GAME_OVER
+            return [GameEvent.GAME_OVER]
+        
+        # Check for victory condition
+        if self.check_victory():
+            self.state = GameState.VICTORY
+            return [GameEvent.VICTORY]
+        
+        # Check if snake ate food
+        if snake.head_cell != food.cell:
+            return []
+        
+        # Determine growth amount based on food type
+        if food.is_bonus:
+            snake.grow(BONUS_FOOD_GROWTH, True)
+            events = [GameEvent.ATE_BONUS]
+        else:
+            snake.grow(1, False)
+            events = [GameEvent.ATE_FOOD]
+        
+        # Check if there's any space left for food
+        if rng is None:
+            rng = self.rng
+            self._rng_state = None  # rng is about to move on
+        if not snake.free_cells.is_full():
+            # Food is drawn from the free cells, so it never spawns on the snake
+            food.randomize_position(snake.free_cells, rng)
+            
+            # Randomly decide if the next food should be a bonus
+            if rng.random() < self.bonus_chance:
+                food.make_bonus()
+            else:
+                food.make_regular()
+        else:
+            # No space left for food, game is won
+            self.state = GameState.VICTORY
+            events.append(GameEvent.VICTORY)
+        return events
+
+
+def step(core, action=None, rng=None):
+    """Functional form of GameCore.step(): returns (core, events).
+    
+    The core is advanced in place, which keeps a step allocation-free.
+    """
+    events = core.step(action, rng)
+    return core, events
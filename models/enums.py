@@ -24,3 +24,26 @@ class Direction(Enum):
     DOWN = 2
     LEFT = 3
     RIGHT = 4
+
+# Events reported by GameCore.step()
+class GameEvent(Enum):
+    ATE_FOOD = 1
+    ATE_BONUS = 2
+    GAME_OVER = 3
+    VICTORY = 4
+
+# The direction that would reverse the snake into its own neck
+OPPOSITE_DIRECTION = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT,
+}
+
+# Cell offset (dx, dy) of one step in each direction
+DIRECTION_STEPS = {
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0),
+}
@@ -1,21 +1,51 @@
 """
 Food class for Snake Game
 """
-import pygame
 import random
-import math
-from constants import GRID_WIDTH, GRID_HEIGHT, GRID_SIZE, RED, YELLOW, BLACK
+from constants import RED, YELLOW
+from models.board import DEFAULT_BOARD
 
 class Food:
-    def __init__(self):
-        self.position = (0, 0)
+    __slots__ = ('board', 'cell', 'is_bonus')
+    
+    def __init__(self, free_cells=None, board=DEFAULT_BOARD, rng=random):
+        self.board = board
+        self.cell = 0  # Flat cell index, y * width + x
         self.is_bonus = False
-        self.randomize_position()
+        if board.level is not None and board.level.food is not None:
+            self.cell = board.level.food  # The level places the first food
+        else:
+            self.randomize_position(free_cells, rng)
+    
+    def copy(self):
+        food = Food.__new__(Food)
+        food.board = self.board
+        food.cell = self.cell
+        food.is_bonus = self.is_bonus
+        return food
+    
+    @property
+    def position(self):
+        width = self.board.width
+        return (self.cell % width, self.cell // width)
     
-    def randomize_position(self):
+    @position.setter
+    def position(self, position):
+        x, y = position
+        self.cell = y * self.board.width + x
+    
+    def randomize_position(self, free_cells=None, rng=random):
+        # With a free-cell index the new position is drawn directly from the
+        # unoccupied cells, so it never lands on the snake
+        if free_cells is not None:
+            cell = free_cells.sample_cell(rng)
+            if cell is not None:
+                self.cell = cell
+            return
+        
         self.position = (
-            random.randint(0, GRID_WIDTH - 1),
-            random.randint(0, GRID_HEIGHT - 1)
+            rng.randint(0, self.board.width - 1),
+            rng.randint(0, self.board.height - 1)
         )
     
     def make_bonus(self):
@@ -25,33 +55,14 @@ class Food:
         self.is_bonus = False
     
     def draw(self, surface):
+        from ui import sprites  # Rendering is optional; keeps pygame out of the game logic
         x, y = self.position
-        center_x = x * GRID_SIZE + GRID_SIZE // 2
-        center_y = y * GRID_SIZE + GRID_SIZE // 2
+        size = self.board.cell_size
         
         if self.is_bonus:
             # Draw a star (bonus food)
-            self.draw_star(surface, center_x, center_y, GRID_SIZE // 2, YELLOW)
+            sprite = sprites.bonus_food(size, YELLOW)
         else:
             # Draw regular food (square)
-            rect = pygame.Rect(
-                x * GRID_SIZE,
-                y * GRID_SIZE,
-                GRID_SIZE, GRID_SIZE
-            )
-            pygame.draw.rect(surface, RED, rect)
-            pygame.draw.rect(surface, BLACK, rect, 1)  # Border
-    
-    def draw_star(self, surface, x, y, size, color):
-        # Draw a 5-pointed star
-        points = []
-        for i in range(10):
-            # Alternate between outer and inner points
-            angle = math.pi / 5 * i - math.pi / 2
-            radius = size if i % 2 == 0 else size / 2
-            point_x = x + radius * math.cos(angle)
-            point_y = y + radius * math.sin(angle)
-            points.append((point_x, point_y))
-        
-        pygame.draw.polygon(surface, color, points)
-        pygame.draw.polygon(surface, BLACK, points, 1)  # Border
+            sprite = sprites.regular_food(size, RED)
+        surface.blit(sprite, (x * size, y * size))
@@ -0,0 +1,109 @@
+"""
+Free-cell index for Snake Game
+"""
+import random
+from array import array
+from itertools import compress
+
+def _typecode(size):
+    # Signed, as _slots marks occupied cells with -1
+    return 'h' if size <= 0x8000 else 'i'
+
+class FreeCellIndex:
+    """Set of unoccupied board cells with O(1) add, remove and uniform sampling.
+    
+    Cells are stored as flat indices (y * width + x). ``_cells`` holds the
+    free cells in no particular order and ``_slots`` maps each cell to its
+    position in ``_cells`` (or -1 when occupied), so a cell can be removed
+    by swapping it with the last entry. Both use 2-byte entries on boards
+    of up to 32768 cells.
+    """
+    __slots__ = ('width', 'height', '_cells', '_slots')
+    
+    def __init__(self, width, height, blocked=None):
+        """All cells start free, except those non-zero in blocked (one byte per cell), if given"""
+        self.width = width
+        self.height = height
+        size = width * height
+        self._cells = array(_typecode(size), range(size))
+        self._slots = array(_typecode(size), range(size))
+        if blocked is not None:
+            for cell in compress(range(size), blocked):
+                self.occupy_cell(cell)
+    
+    @classmethod
+    def from_cells(cls, width, height, cells):
+        """Index holding exactly the given free cells, in that order"""
+        index = cls.__new__(cls)
+        index.width = width
+        index.height = height
+        index._fill(cells)
+        return index
+    
+    def _fill(self, cells):
+        size = self.width * self.height
+        self._cells = array(_typecode(size), cells)
+        self._slots = array(_typecode(size), [-1]) * size
+        for slot, cell in enumerate(self._cells):
+            self._slots[cell] = slot
+    
+    def copy(self):
+        """Independent copy in the same order, so it samples the same cells from the same rng"""
+        index = FreeCellIndex.__new__(FreeCellIndex)
+        index.width = self.width
+        index.height = self.height
+        index._cells = self._cells[:]
+        index._slots = self._slots[:]
+        return index
+    
+    def cells(self):
+        """The free cells as flat indices, in sampling order (do not modify)"""
+        return self._cells
+    
+    def __len__(self):
+        return len(self._cells)
+    
+    def __contains__(self, position):
+        x, y = position
+        return self._slots[y * self.width + x] >= 0
+    
+    def is_full(self):
+        """Return True if there is no free cell left on the board"""
+        return not self._cells
+    
+    def occupy(self, position):
+        x, y = position
+        self.occupy_cell(y * self.width + x)
+    
+    def occupy_cell(self, cell):
+        slot = self._slots[cell]
+        if slot < 0:
+            return
+        last = self._cells.pop()
+        if last != cell:
+            self._cells[slot] = last
+            self._slots[last] = slot
+        self._slots[cell] = -1
+    
+    def release(self, position):
+        x, y = position
+        self.release_cell(y * self.width + x)
+    
+    def release_cell(self, cell):
+        if self._slots[cell] >= 0:
+            return
+        self._slots[cell] = len(self._cells)
+        self._cells.append(cell)
+    
+    def sample(self, rng=random):
+        """Return a uniformly chosen free (x, y) cell, or None if the board is full"""
+        cell = self.sample_cell(rng)
+        if cell is None:
+            return None
+        return (cell % self.width, cell // self.width)
+    
+    def sample_cell(self, rng=random):
+        """Like sample(), but returns a flat cell index"""
+        if not self._cells:
+            return None
+        return self._cells[rng.randrange(len(self._cells))]
@@ -0,0 +1,46 @@
+"""
+Buffered player input for Snake Game
+"""
+from collections import deque
+
+from constants import INPUT_BUFFER_SIZE
+from models.enums import OPPOSITE_DIRECTION
+
+class InputQueue:
+    """Turns pressed since the last move, applied one per tick.
+    
+    Key presses can arrive faster than the snake moves. Instead of letting
+    a later press overwrite an earlier one, each turn waits in a bounded
+    queue and the game takes at most one per move, so two quick presses
+    land on two consecutive ticks.
+    """
+    
+    def __init__(self, maxlen=INPUT_BUFFER_SIZE):
+        self.maxlen = maxlen
+        self._turns = deque()
+    
+    def __len__(self):
+        return len(self._turns)
+    
+    def push(self, direction, current):
+        """Queue a turn after the snake's current direction; returns False if it was dropped.
+        
+        A turn that repeats or reverses the one before it would be a no-op
+        or fatal, so it is dropped, as is any press once the queue is full.
+        """
+        last = self._turns[-1] if self._turns else current
+        if direction == last or direction == OPPOSITE_DIRECTION[last] or len(self._turns) >= self.maxlen:
+            return False
+        self._turns.append(direction)
+        return True
+    
+    def pop(self, current):
+        """Return the next queued turn that is valid from the current direction, or None"""
+        while self._turns:
+            direction = self._turns.popleft()
+            if direction != current and direction != OPPOSITE_DIRECTION[current]:
+                return direction
+        return None
+    
+    def clear(self):
+        self._turns.clear()
@@ -0,0 +1,64 @@
+"""
+Move tables for Snake Game
+
+A MoveTable holds, for one board size, the cell one step away from every
+cell in every direction, with WALL where the step would leave the board.
+On a wrap-around board such steps come back in on the opposite edge
+instead, so there are no walls at all.
+Moving is then a single array lookup instead of a branch on the
+direction plus a bounds check. Tables are built with array slicing, so
+even 1000x1000 boards take milliseconds, and move_table() shares one
+table between every game of the same size.
+"""
+from array import array
+
+from models.enums import DIRECTION_STEPS
+
+WALL = -1  # Next cell of a step off the board; every real cell index is >= 0
+
+class MoveTable:
+    __slots__ = ('width', 'height', 'wrap', 'next_cell')
+    
+    def __init__(self, width, height, wrap=False):
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        cells = width * height
+        # Every table starts as a slice of one run of indices, shifted by the step
+        indices = array('i', range(-width, cells + width))
+        self.next_cell = {}  # Direction -> array of the next cell index (or WALL) per cell
+        for direction, (dx, dy) in DIRECTION_STEPS.items():
+            step = dy * width + dx
+            next_cell = indices[width + step:width + step + cells]
+            # Fix up the edge the step leaves through: top or bottom row, left or right column
+            if dy < 0:
+                edge = slice(0, width)
+                across = range(cells - width, cells)
+            elif dy > 0:
+                edge = slice(cells - width, cells)
+                across = range(width)
+            elif dx < 0:
+                edge = slice(0, cells, width)
+                across = range(width - 1, cells, width)
+            else:
+                edge = slice(width - 1, cells, width)
+                across = range(0, cells, width)
+            next_cell[edge] = array('i', across) if wrap else array('i', [WALL]) * len(across)
+            self.next_cell[direction] = next_cell
+    
+    def neighbors(self, cell):
+        """(direction, cell) pairs for the on-board neighbours of a cell"""
+        return tuple(
+            (direction, next_cell[cell]) for direction, next_cell in self.next_cell.items()
+            if next_cell[cell] != WALL
+        )
+
+
+_tables = {}
+
+def move_table(width, height, wrap=False):
+    """Shared MoveTable for a board size, built on first use"""
+    table = _tables.get((width, height, wrap))
+    if table is None:
+        table = _tables[(width, height, wrap)] = MoveTable(width, height, wrap)
+    return table
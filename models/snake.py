@@ -1,32 +1,264 @@
 """
 Snake class for Snake Game
 """
-import pygame
-from models.enums import Direction
-from constants import GRID_WIDTH, GRID_HEIGHT, GRID_SIZE, GREEN, BLACK
+import weakref
+from array import array
+from itertools import chain
+
+from models.enums import Direction, OPPOSITE_DIRECTION
+from models.board import DEFAULT_BOARD, cell_typecode
+from models.free_cells import FreeCellIndex
+from models.level import BODY, EMPTY
+from models.moves import WALL
+from constants import GREEN
+
+RING_START_SIZE = 16  # Body cells the ring holds before it first grows
+
+# Boards from this size share the body, grid and free cells with forks until one of them moves
+SHARE_MIN_CELLS = 4096
 
 class Snake:
-    def __init__(self):
+    __slots__ = (
+        'board', 'length', 'score', 'is_alive', 'regular_food_eaten', 'bonus_food_eaten', 'moves',
+        'free_cells', '_ring', '_head', '_size', '_occupied', '_move_table', '_direction', '_opposite', '_next_cell',
+        '_lender', '_borrowers', '_shared', '__weakref__',
+    )
+    
+    def __init__(self, board=DEFAULT_BOARD):
+        self.board = board
         self.reset()
     
     def reset(self):
+        if getattr(self, '_shared', False):
+            self._unshare(copy=False)
+        self._lender = None
+        self._borrowers = None
+        self._shared = False
         self.length = 1
-        self.positions = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
+        # Body segments, head first, as flat cell indices (y * width + x) in a
+        # ring buffer: the head is at _ring[_head] and the body runs on from
+        # there for _size cells, wrapping around. The ring starts small and
+        # doubles when full, so a short snake on a big board stays small. The
+        # typed cell grid (one byte per cell, see models/level.py) marks the
+        # body, walls and obstacles, so a collision check is one lookup, and
+        # free_cells mirrors the grid so food can be placed without retrying.
+        self._ring = array(cell_typecode(self.board.cells), [0]) * min(RING_START_SIZE, self.board.cells)
+        self._head = 0
+        self._size = 0
+        self._occupied = self.board.new_grid()
+        self._move_table = self.board.move_table
+        self.free_cells = FreeCellIndex(
+            self.board.width, self.board.height, None if self.board.level is None else self._occupied
+        )
+        start_x, start_y = self.board.start
+        self._push_head(start_y * self.board.width + start_x)
+        self.moves = 0  # Successful moves so far, lets renderers tell what changed
         self.direction = Direction.RIGHT
         self.score = 0
         self.is_alive = True
         self.regular_food_eaten = 0
         self.bonus_food_eaten = 0
     
+    @property
+    def positions(self):
+        """Body segments as a list of (x, y) tuples, head first"""
+        return list(self.iter_positions())
+    
+    def iter_positions(self):
+        """Iterate over body segments as (x, y) tuples, head first"""
+        width = self.board.width
+        for cell in self.iter_cells():
+            yield (cell % width, cell // width)
+    
+    def iter_cells(self):
+        """Iterate over body segments as flat cell indices, head first"""
+        ring, head, size = self._ring, self._head, self._size
+        end = head + size
+        if end <= len(ring):
+            return iter(ring[head:end])
+        return chain(ring[head:], ring[:end - len(ring)])
+    
+    def __len__(self):
+        return self._size
+    
+    def occupies(self, position):
+        """Return True if any body segment is on the given (x, y) cell"""
+        x, y = position
+        width = self.board.width
+        if x < 0 or x >= width or y < 0 or y >= self.board.height:
+            return False
+        return self._occupied[y * width + x] == BODY
+    
+    def _push_head(self, cell):
+        if self._size == len(self._ring):
+            self._grow_ring()
+        self._head = (self._head - 1) % len(self._ring)
+        self._ring[self._head] = cell
+        self._size += 1
+        self._occupied[cell] = BODY
+        self.free_cells.occupy_cell(cell)
+    
+    def _pop_tail(self):
+        self._size -= 1
+        cell = self._ring[(self._head + self._size) % len(self._ring)]
+        self._occupied[cell] = EMPTY
+        self.free_cells.release_cell(cell)
+    
+    def _grow_ring(self):
+        # Lay the body out from the start of a ring twice the size (the body never outgrows the board)
+        body = self.cells(self._ring.typecode)
+        body.extend(array(body.typecode, [0]) * (min(2 * self._size, self.board.cells) - self._size))
+        self._ring = body
+        self._head = 0
+    
+    @property
+    def head_cell(self):
+        return self._ring[self._head]
+    
+    @property
+    def tail_cell(self):
+        return self._ring[(self._head + self._size - 1) % len(self._ring)]
+    
     def get_head_position(self):
-        return self.positions[0]
+        cell = self._ring[self._head]
+        width = self.board.width
+        return (cell % width, cell // width)
+    
+    def get_tail_position(self):
+        cell = self.tail_cell
+        width = self.board.width
+        return (cell % width, cell // width)
+    
+    def cells(self, typecode='I'):
+        """Body as an array of flat cell indices (y * width + x), head first"""
+        ring, head, size = self._ring, self._head, self._size
+        end = head + size
+        if end <= len(ring):
+            body = ring[head:end]
+        else:
+            body = ring[head:] + ring[:end - len(ring)]
+        return body if typecode == body.typecode else array(typecode, body)
+    
+    def restore(self, snapshot):
+        """Take on the body and counters saved in a GameSnapshot"""
+        if getattr(self, '_shared', False):
+            self._unshare(copy=False)
+        body = snapshot.body
+        typecode = cell_typecode(self.board.cells)
+        self._ring = body[:] if typecode == body.typecode else array(typecode, body)
+        self._head = 0
+        self._size = len(body)
+        self._move_table = self.board.move_table
+        if getattr(self, '_occupied', None) is None:
+            self._occupied = bytearray(snapshot.occupancy)
+            self._lender = None
+            self._borrowers = None
+            self._shared = False
+        else:
+            self._occupied[:] = snapshot.occupancy  # In place, so views of the grid stay valid
+        self.free_cells = snapshot.free_cells.copy()
+        self.direction = snapshot.direction
+        self.length = snapshot.length
+        self.score = snapshot.score
+        self.is_alive = snapshot.is_alive
+        self.regular_food_eaten = snapshot.regular_food_eaten
+        self.bonus_food_eaten = snapshot.bonus_food_eaten
+        self.moves = snapshot.moves
+    
+    def fork(self):
+        """Independent copy of the snake; on big boards it shares the body, grid and free cells until either moves"""
+        clone = Snake.__new__(Snake)
+        clone.board = self.board
+        clone.length = self.length
+        clone.score = self.score
+        clone.is_alive = self.is_alive
+        clone.regular_food_eaten = self.regular_food_eaten
+        clone.bonus_food_eaten = self.bonus_food_eaten
+        clone.moves = self.moves
+        clone._head = self._head
+        clone._size = self._size
+        clone._move_table = self._move_table
+        clone._direction = self._direction
+        clone._opposite = self._opposite
+        clone._next_cell = self._next_cell
+        clone._borrowers = None
+        if self.board.cells < SHARE_MIN_CELLS:
+            clone._ring = self._ring[:]
+            clone._occupied = self._occupied[:]
+            clone.free_cells = self.free_cells.copy()
+            clone._lender = None
+            clone._shared = False
+        else:
+            # Borrow from whichever snake owns the buffers, never from another borrower
+            owner = self._lender or self
+            clone._ring = owner._ring
+            clone._occupied = owner._occupied
+            clone.free_cells = owner.free_cells
+            clone._lender = owner
+            clone._shared = True
+            if owner._borrowers is None:
+                owner._borrowers = weakref.WeakSet()
+            owner._borrowers.add(clone)
+            owner._shared = True
+        return clone
+    
+    def _unshare(self, copy=True):
+        """Stop sharing the body, grid and free cells, before changing them"""
+        lender = self._lender
+        if lender is not None:
+            # A borrower takes its own copies (or none, when they are about to be replaced)
+            self._lender = None
+            lender._borrowers.discard(self)
+            if copy:
+                self._ring = self._ring[:]
+                self._occupied = self._occupied[:]
+                self.free_cells = self.free_cells.copy()
+            else:
+                self._occupied = None
+        elif self._borrowers:
+            # The owner keeps its buffers, so views of its grid stay valid, and
+            # hands one copy on to the snakes still borrowing them
+            heir, *rest = self._borrowers
+            heir._lender = None
+            heir._ring = self._ring[:]
+            heir._occupied = self._occupied[:]
+            heir.free_cells = self.free_cells.copy()
+            heir._shared = bool(rest)
+            if rest:
+                heir._borrowers = weakref.WeakSet(rest)
+                for snake in rest:
+                    snake._lender = heir
+                    snake._ring = heir._ring
+                    snake._occupied = heir._occupied
+                    snake.free_cells = heir.free_cells
+        self._borrowers = None
+        self._shared = False
+    
+    @property
+    def occupancy(self):
+        """Typed cell grid, one byte per cell at y * width + x: BODY (1) where the body is.
+        
+        On a level, walls and obstacles are marked too; any non-zero cell
+        blocks the snake. The grid is shared, not copied: treat it as read-only.
+        A fork on a big board only gets a grid of its own when it first moves.
+        """
+        return self._occupied
+    
+    @property
+    def direction(self):
+        return self._direction
+    
+    @direction.setter
+    def direction(self, direction):
+        # Turning looks up this direction's row of the move table once, so
+        # moving never has to branch on the direction
+        self._direction = direction
+        self._opposite = OPPOSITE_DIRECTION[direction]
+        self._next_cell = self._move_table.next_cell[direction]
     
     def change_direction(self, direction):
         # Prevent 180-degree turns
-        if (direction == Direction.UP and self.direction != Direction.DOWN or
-            direction == Direction.DOWN and self.direction != Direction.UP or
-            direction == Direction.LEFT and self.direction != Direction.RIGHT or
-            direction == Direction.RIGHT and self.direction != Direction.LEFT):
+        if direction is not self._opposite and direction is not self._direction:
             self.direction = direction
         # If invalid direction, just keep current direction
         # This prevents accidental game over by pressing opposite direction
@@ -35,34 +267,27 @@ class Snake:
         if not self.is_alive:
             return
         
-        head_x, head_y = self.get_head_position()
-        
-        if self.direction == Direction.UP:
-            head_y -= 1
-        elif self.direction == Direction.DOWN:
-            head_y += 1
-        elif self.direction == Direction.LEFT:
-            head_x -= 1
-        elif self.direction == Direction.RIGHT:
-            head_x += 1
-        
-        # Check for wall collision
-        if (head_x < 0 or head_x >= GRID_WIDTH or 
-            head_y < 0 or head_y >= GRID_HEIGHT):
+        # Check for leaving the board (never happens when it wraps around)
+        head = self._next_cell[self._ring[self._head]]
+        if head == WALL:
             self.is_alive = False
             return
         
-        # Check for self collision
-        if (head_x, head_y) in self.positions[1:]:
+        # Check for hitting the body, a wall or an obstacle (the tail still counts, as it has not moved yet)
+        if self._occupied[head]:
             self.is_alive = False
             return
         
+        if self._shared:
+            self._unshare()
+        
         # Add new head position
-        self.positions.insert(0, (head_x, head_y))
+        self._push_head(head)
+        self.moves += 1
         
         # Remove tail if not growing
-        if len(self.positions) > self.length:
-            self.positions.pop()
+        if self._size > self.length:
+            self._pop_tail()
     
     def grow(self, amount=1, is_bonus=False):
         self.length += amount
@@ -74,8 +299,21 @@ class Snake:
             self.regular_food_eaten += 1
     
     def draw(self, surface):
-        for i, (x, y) in enumerate(self.positions):
-            color = GREEN if i == 0 else GREEN  # Head same color as body for now
-            rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            pygame.draw.rect(surface, color, rect)
-            pygame.draw.rect(surface, BLACK, rect, 1)  # Border
+        from ui import sprites  # Rendering is optional; keeps pygame out of the game logic
+        # One blits() call for the whole body keeps per-segment Python work small
+        size = self.board.cell_size
+        width = self.board.width
+        body = sprites.snake_body(size, GREEN)
+        blits = [(body, (cell % width * size, cell // width * size)) for cell in self.iter_cells()]
+        blits[0] = (sprites.snake_head(size, GREEN), blits[0][1])  # Head same color as body for now
+        surface.blits(blits, False)
+    
+    def draw_segment(self, surface, position):
+        from ui import sprites
+        x, y = position
+        size = self.board.cell_size
+        if position == self.get_head_position():
+            sprite = sprites.snake_head(size, GREEN)  # Head same color as body for now
+        else:
+            sprite = sprites.snake_body(size, GREEN)
+        surface.blit(sprite, (x * size, y * size))
@@ -0,0 +1,129 @@
+"""
+Game state snapshots for Snake Game
+
+A GameSnapshot holds everything GameCore.step() depends on: the body as
+an array of flat cell indices (y * width + x) from head to tail, the
+occupancy grid, the free-cell index (food is drawn from it, so its order
+matters), the snake's counters, the food and the random stream's state.
+A restored game therefore plays on exactly as the original would have.
+
+Snapshots are never modified once taken, so one can be restored any
+number of times, and GameCore reuses the random state of its last
+snapshot until food is eaten. to_bytes() and from_bytes() pass
+snapshots between processes.
+"""
+import struct
+import sys
+from array import array
+
+from models.board import Board, cell_typecode
+from models.enums import Direction, GameState
+from models.free_cells import FreeCellIndex
+from models.level import BODY
+
+MAGIC = b'SNKS'
+VERSION = 2
+
+# magic, version, width, height, state, direction, is_alive, food_is_bonus,
+# ticks, length, score, regular_food_eaten, bonus_food_eaten, moves, food,
+# seed, body length, free cells, random state length, has gauss_next, gauss_next,
+# board flags, level digest (zeros without a level)
+_HEADER = struct.Struct('<4sBHHBBBBIIIIIIIQIIIBdB8s')
+
+# Board flags
+WRAP = 1
+_NO_LEVEL = bytes(8)
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values = values[:]
+        values.byteswap()
+    return values.tobytes()
+
+def _from_little_endian(typecode, data):
+    values = array(typecode, data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class GameSnapshot:
+    __slots__ = (
+        'board', 'body', 'occupancy', 'free_cells', 'direction', 'length', 'score',
+        'regular_food_eaten', 'bonus_food_eaten', 'is_alive', 'moves', 'food', 'food_is_bonus',
+        'state', 'ticks', 'seed', 'rng_state',
+    )
+    
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+    
+    @property
+    def head(self):
+        return self.body[0]
+    
+    @property
+    def tail(self):
+        return self.body[-1]
+    
+    def to_bytes(self):
+        _, internal, gauss_next = self.rng_state
+        free = self.free_cells.cells()
+        board = self.board
+        header = _HEADER.pack(
+            MAGIC, VERSION, board.width, board.height, self.state.value, self.direction.value,
+            self.is_alive, self.food_is_bonus, self.ticks, self.length, self.score,
+            self.regular_food_eaten, self.bonus_food_eaten, self.moves, self.food, self.seed,
+            len(self.body), len(free), len(internal), gauss_next is not None, gauss_next or 0.0,
+            WRAP if board.wrap else 0, board.level_digest or _NO_LEVEL
+        )
+        return b''.join([
+            header,
+            _little_endian(self.body),
+            _little_endian(array(self.body.typecode, free)),
+            _little_endian(array('I', internal)),
+        ])
+    
+    @classmethod
+    def from_bytes(cls, data, board=None):
+        """Rebuild a snapshot; board must match the snapshot's and is only optional without a level"""
+        if len(data) < _HEADER.size:
+            raise ValueError("Snapshot is truncated")
+        (magic, version, width, height, state, direction, is_alive, food_is_bonus, ticks, length, score,
+         regular_food_eaten, bonus_food_eaten, moves, food, seed, body_length, free_length, rng_length,
+         has_gauss, gauss_next, flags, level_digest) = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        wrap = bool(flags & WRAP)
+        level_digest = None if level_digest == _NO_LEVEL else level_digest
+        if board is None:
+            if level_digest is not None:
+                raise ValueError("Snapshot is for a level, which has to be given")
+            board = Board(width, height, 0, wrap)
+        else:
+            board.check(width, height, wrap, level_digest, "Snapshot")
+        
+        typecode = cell_typecode(board.cells)
+        size = array(typecode).itemsize
+        offset = _HEADER.size
+        ends = (offset + body_length * size, offset + (body_length + free_length) * size)
+        if len(data) != ends[1] + rng_length * 4:
+            raise ValueError("Snapshot is truncated")
+        body = _from_little_endian(typecode, data[offset:ends[0]])
+        free = _from_little_endian(typecode, data[ends[0]:ends[1]])
+        internal = _from_little_endian('I', data[ends[1]:])
+        
+        occupancy = board.new_grid()
+        for cell in body:
+            occupancy[cell] = BODY
+        return cls(
+            board=board, body=body, occupancy=bytes(occupancy),
+            free_cells=FreeCellIndex.from_cells(width, height, free),
+            direction=Direction(direction), length=length, score=score,
+            regular_food_eaten=regular_food_eaten, bonus_food_eaten=bonus_food_eaten,
+            is_alive=bool(is_alive), moves=moves, food=food, food_is_bonus=bool(food_is_bonus),
+            state=GameState(state), ticks=ticks, seed=seed,
+            rng_state=(3, tuple(internal), gauss_next if has_gauss else None),
+        )
@@ -0,0 +1,151 @@
+"""
+Thin client for networked Snake Game
+
+MatchView rebuilds a match from the server's messages: it keeps its own
+copy of the body and applies each tick's delta to it. main() wraps it in
+a pygame window that sends the arrow keys as turns; R starts another
+match once one is over.
+
+    python -m net.client --difficulty hard
+"""
+import argparse
+import socket
+from collections import deque
+
+from constants import (
+    SERVER_HOST, SERVER_PORT, BONUS_FOOD_GROWTH, RENDER_FPS, GREEN, RED, YELLOW, BLACK, FONT_SIZE
+)
+from models.board import Board
+from models.enums import Difficulty, Direction, GameState, DIRECTION_STEPS
+from net.protocol import JOIN, TURN, START, TICK, END, TAIL_REMOVED, FOOD_BONUS, pack, parse
+
+# Direction of a one-cell step, the inverse of DIRECTION_STEPS
+_STEP_DIRECTIONS = {step: direction for direction, step in DIRECTION_STEPS.items()}
+
+class MatchView:
+    """A client's copy of a match"""
+    
+    def __init__(self):
+        self.match_id = None
+        self.state = None  # GameState once a match has started
+        self.body = deque()  # Head first
+        self.occupied = set()
+        self.direction = Direction.RIGHT
+        self.food = None
+        self.food_is_bonus = False
+        self.ticks = 0
+        self.score = 0
+    
+    @property
+    def head(self):
+        return self.body[0]
+    
+    def apply(self, message):
+        """Update the copy with one message from the server"""
+        kind = message[0]
+        if kind == START:
+            (_, self.match_id, self.seed, difficulty, self.width, self.height,
+             head_x, head_y, food_x, food_y, bonus) = message
+            self.difficulty = Difficulty(difficulty)
+            self.state = GameState.PLAYING
+            self.body = deque([(head_x, head_y)])
+            self.occupied = {(head_x, head_y)}
+            self.direction = Direction.RIGHT
+            self.food = (food_x, food_y)
+            self.food_is_bonus = bool(bonus)
+            self.ticks = 0
+            self.score = 0
+        
+        elif kind == TICK:
+            _, self.ticks, flags, head_x, head_y, food_x, food_y = message
+            head = (head_x, head_y)
+            old_x, old_y = self.body[0]
+            self.direction = _STEP_DIRECTIONS.get((head_x - old_x, head_y - old_y), self.direction)
+            if head == self.food:
+                self.score += 10 * (BONUS_FOOD_GROWTH if self.food_is_bonus else 1)
+            self.body.appendleft(head)
+            self.occupied.add(head)
+            if flags & TAIL_REMOVED:
+                self.occupied.discard(self.body.pop())
+            self.food = (food_x, food_y)
+            self.food_is_bonus = bool(flags & FOOD_BONUS)
+        
+        elif kind == END:
+            _, state, self.ticks, self.score, _ = message
+            self.state = GameState(state)
+    
+    def draw(self, surface, cell_size):
+        from ui import sprites  # Rendering is optional; keeps pygame out of the match state
+        width, height = surface.get_size()
+        surface.blit(sprites.background(width, height, cell_size), (0, 0))
+        body = sprites.snake_body(cell_size, GREEN)
+        surface.blits([(body, (x * cell_size, y * cell_size)) for x, y in self.body], False)
+        if self.food is not None:
+            food = sprites.bonus_food(cell_size, YELLOW) if self.food_is_bonus else sprites.regular_food(cell_size, RED)
+            surface.blit(food, (self.food[0] * cell_size, self.food[1] * cell_size))
+
+
+_KEYS = {'K_UP': Direction.UP, 'K_DOWN': Direction.DOWN, 'K_LEFT': Direction.LEFT, 'K_RIGHT': Direction.RIGHT}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play Snake on a match server')
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--difficulty', choices=[d.name.lower() for d in Difficulty], default='normal')
+    parser.add_argument('--width', type=int, default=10)
+    parser.add_argument('--height', type=int, default=10)
+    args = parser.parse_args(argv)
+    
+    import pygame
+    from ui.text import get_font, render
+    
+    join = pack(JOIN, Difficulty[args.difficulty.upper()].value, args.width, args.height)
+    connection = socket.create_connection((args.host, args.port))
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    connection.sendall(join)
+    connection.setblocking(False)
+    
+    board = Board(args.width, args.height, Board.fit_cell_size(args.width, args.height))
+    pygame.init()
+    screen = pygame.display.set_mode((board.screen_width, board.screen_height))
+    pygame.display.set_caption('Snake Game (online)')
+    clock = pygame.time.Clock()
+    keys = {getattr(pygame, name): direction for name, direction in _KEYS.items()}
+    view = MatchView()
+    received = bytearray()
+    
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                connection.close()
+                pygame.quit()
+                return
+            if event.type == pygame.KEYDOWN:
+                if event.key in keys and view.state == GameState.PLAYING:
+                    connection.send(pack(TURN, keys[event.key].value))
+                elif event.key == pygame.K_r and view.state in (GameState.GAME_OVER, GameState.VICTORY):
+                    connection.send(join)
+        
+        try:
+            data = connection.recv(65536)
+        except BlockingIOError:
+            data = None
+        if data == b'':
+            print("Server closed the connection")
+            pygame.quit()
+            return
+        if data:
+            received += data
+            for message in parse(received):
+                view.apply(message)
+        
+        view.draw(screen, board.cell_size)
+        status = f'Score: {view.score}'
+        if view.state in (GameState.GAME_OVER, GameState.VICTORY):
+            status += f' - {view.state.name.replace("_", " ").title()}, press R to play again'
+        screen.blit(render(get_font(FONT_SIZE), status, BLACK), (10, 10))
+        pygame.display.flip()
+        clock.tick(RENDER_FPS)
+
+if __name__ == "__main__":
+    main()
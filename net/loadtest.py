@@ -0,0 +1,143 @@
+"""
+Loopback load test for the Snake match server
+
+Starts a server in a child process (or connects to a running one), then
+opens many connections from a single event loop. Each connection plays
+matches back to back, steering greedily towards the food, and checks the
+deltas it receives against its own copy of the board: every head must be
+one step from the last, and each match's final score must match the
+score the client worked out from the deltas. The server prints its own
+match count, tick rate and CPU use; the client side reports ticks
+received, mismatches and how far tick arrivals drift from the tick rate.
+
+    python -m net.loadtest --matches 1000 --seconds 30
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+from constants import SERVER_HOST
+from models.core import snake_speed
+from models.enums import Difficulty, GameState, DIRECTION_STEPS, OPPOSITE_DIRECTION
+from net.client import MatchView
+from net.protocol import JOIN, TURN, START, TICK, END, pack, read_message
+from utils.profiler import RingBuffer, percentile
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def steer(view, rng):
+    """Safe step closest to the food, or None to keep going"""
+    head_x, head_y = view.head
+    food_x, food_y = view.food
+    opposite = OPPOSITE_DIRECTION[view.direction]
+    best = None
+    best_key = None
+    for direction, (dx, dy) in DIRECTION_STEPS.items():
+        x, y = head_x + dx, head_y + dy
+        if direction == opposite or not (0 <= x < view.width and 0 <= y < view.height) or (x, y) in view.occupied:
+            continue
+        key = (abs(food_x - x) + abs(food_y - y), rng.random())
+        if best_key is None or key < best_key:
+            best, best_key = direction, key
+    return best
+
+async def play(host, port, join, deadline, stats, jitter, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(join)
+    view = MatchView()
+    interval = None
+    last_tick = None
+    try:
+        while time.perf_counter() < deadline:
+            message = await read_message(reader)
+            now = time.perf_counter()
+            kind = message[0]
+            if kind == TICK:
+                old_x, old_y = view.head
+                view.apply(message)
+                head_x, head_y = view.head
+                if abs(head_x - old_x) + abs(head_y - old_y) != 1:
+                    stats['mismatches'] += 1
+                if last_tick is not None:
+                    jitter.append(abs(now - last_tick - interval))
+                last_tick = now
+                stats['ticks'] += 1
+                direction = steer(view, rng)
+                if direction is not None and direction != view.direction:
+                    writer.write(pack(TURN, direction.value))
+            elif kind == END:
+                score = view.score
+                view.apply(message)
+                if view.score != score:
+                    stats['mismatches'] += 1
+                stats['victories' if view.state == GameState.VICTORY else 'game_overs'] += 1
+                last_tick = None
+                writer.write(join)
+            elif kind == START:
+                view.apply(message)
+                interval = 1.0 / snake_speed(view.difficulty)
+                last_tick = now
+    except (asyncio.IncompleteReadError, ConnectionError):
+        stats['disconnects'] += 1
+    finally:
+        writer.close()
+
+async def run(host, port, matches, seconds, difficulty, width, height, seed):
+    stats = {'ticks': 0, 'mismatches': 0, 'victories': 0, 'game_overs': 0, 'disconnects': 0}
+    jitter = RingBuffer(100000)
+    rng = random.Random(seed)
+    join = pack(JOIN, difficulty.value, width, height)
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        play(host, port, join, deadline, stats, jitter, random.Random(rng.getrandbits(64)))
+        for _ in range(matches)
+    ))
+    elapsed = time.perf_counter() - start
+    values = sorted(jitter.values())
+    print(f"{matches} connections for {elapsed:.1f}s: {stats['ticks'] / elapsed:,.0f} ticks/s received, "
+          f"{stats['game_overs'] + stats['victories']} matches finished ({stats['victories']} victories), "
+          f"{stats['mismatches']} mismatches, {stats['disconnects']} disconnects")
+    print(f"Tick arrival drift: p50 {percentile(values, 0.5) * 1000:.1f}ms, "
+          f"p99 {percentile(values, 0.99) * 1000:.1f}ms, max {values[-1] * 1000 if values else 0:.1f}ms")
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the Snake match server over loopback')
+    parser.add_argument('--matches', type=int, default=1000, help='concurrent connections')
+    parser.add_argument('--seconds', type=float, default=30.0)
+    parser.add_argument('--difficulty', choices=[d.name.lower() for d in Difficulty], default='normal')
+    parser.add_argument('--width', type=int, default=20)
+    parser.add_argument('--height', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--connect', metavar='HOST:PORT', help='use a running server instead of starting one')
+    args = parser.parse_args(argv)
+    
+    server = None
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+        port = int(port)
+    else:
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'net.server', '--host', SERVER_HOST, '--port', '0', '--stats-interval', '5'],
+            cwd=GAME_DIR, stdout=subprocess.PIPE, text=True
+        )
+        # "Serving Snake matches on host:port"
+        host, port = server.stdout.readline().split()[-1].rsplit(':', 1)
+        port = int(port)
+    
+    try:
+        stats = asyncio.run(run(host, port, args.matches, args.seconds, Difficulty[args.difficulty.upper()],
+                                args.width, args.height, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            print("Server:", *server.stdout.readlines()[-1:], end='')
+    return 1 if stats['mismatches'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
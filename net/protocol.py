@@ -0,0 +1,70 @@
+"""
+Wire protocol for networked Snake Game
+
+Every message is a fixed-size little-endian struct that starts with its
+type byte, so a reader knows how many bytes to wait for after the first
+one. Unpacked messages are tuples that start with the type.
+
+Client to server:
+  JOIN  (difficulty, width, height): ask for a new match
+  TURN  (direction): queue a turn, applied at most one per tick
+
+Server to client:
+  START (match id, seed, difficulty, width, height, head x, y, food x, y, food is bonus)
+  TICK  (tick, flags, head x, y, food x, y): the change made by one move
+  END   (GameState value, ticks, score, length)
+
+A TICK is a delta, not the whole snake: the head moved to a new cell and,
+with the TAIL_REMOVED flag, the last segment was dropped. The client
+keeps its own copy of the body, so a tick costs 14 bytes whatever the
+snake's length. The food is always sent; when it moved, the snake ate.
+"""
+import struct
+
+JOIN = 1
+TURN = 2
+START = 3
+TICK = 4
+END = 5
+
+# TICK flags
+TAIL_REMOVED = 1
+FOOD_BONUS = 2
+
+_MESSAGES = {
+    JOIN: struct.Struct('<BBHH'),
+    TURN: struct.Struct('<BB'),
+    START: struct.Struct('<BIQBHHHHHHB'),
+    TICK: struct.Struct('<BIBHHHH'),
+    END: struct.Struct('<BBIII'),
+}
+
+def pack(*message):
+    """Encode a message given as its type followed by its fields"""
+    return _MESSAGES[message[0]].pack(*message)
+
+def message_size(kind):
+    """Size in bytes of a message of the given type"""
+    layout = _MESSAGES.get(kind)
+    if layout is None:
+        raise ValueError(f"Unknown message type {kind}")
+    return layout.size
+
+async def read_message(reader):
+    """Read one message from an asyncio StreamReader"""
+    kind = await reader.readexactly(1)
+    rest = await reader.readexactly(message_size(kind[0]) - 1)
+    return _MESSAGES[kind[0]].unpack(kind + rest)
+
+def parse(buffer):
+    """Unpack and remove every complete message at the start of a bytearray"""
+    messages = []
+    offset = 0
+    while offset < len(buffer):
+        size = message_size(buffer[offset])
+        if offset + size > len(buffer):
+            break
+        messages.append(_MESSAGES[buffer[offset]].unpack_from(buffer, offset))
+        offset += size
+    del buffer[:offset]
+    return messages
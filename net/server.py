@@ -0,0 +1,211 @@
+"""
+Match server for networked Snake Game
+
+One asyncio event loop hosts any number of matches, one at a time per
+TCP connection. All matches of a difficulty are stepped by a single
+ticker at that difficulty's snake_speed(), so a thousand matches cost
+three timers rather than a thousand. Each tick a match sends its client a
+small delta (see net/protocol.py) instead of the whole snake.
+
+Memory per match is bounded: the rules live in a GameCore on a board of
+at most MAX_NET_BOARD_SIZE cells a side, turns wait in a short
+InputQueue, and a client that lets more than NET_WRITE_LIMIT bytes pile
+up unsent is dropped instead of being buffered for.
+
+    python -m net.server --port 8765 --stats-interval 5
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+from constants import SERVER_HOST, SERVER_PORT, MAX_NET_BOARD_SIZE, NET_WRITE_LIMIT, NET_JOIN_TIMEOUT
+from models.board import Board
+from models.core import GameCore, snake_speed
+from models.enums import Difficulty, Direction
+from models.input_queue import InputQueue
+from net.protocol import JOIN, TURN, START, TICK, END, TAIL_REMOVED, FOOD_BONUS, pack, read_message
+
+_DIRECTIONS = {direction.value: direction for direction in Direction}
+
+class Match:
+    """One game played by one client"""
+    
+    def __init__(self, match_id, board, difficulty, writer, seed=None):
+        self.id = match_id
+        self.core = GameCore(board, seed)
+        self.difficulty = difficulty
+        self.writer = writer
+        self.turns = InputQueue()
+    
+    def start_message(self):
+        core = self.core
+        head_x, head_y = core.snake.get_head_position()
+        food_x, food_y = core.food.position
+        return pack(START, self.id, core.seed, self.difficulty.value, core.board.width, core.board.height,
+                    head_x, head_y, food_x, food_y, core.food.is_bonus)
+    
+    def tick(self):
+        """Make one move and return the message that describes it"""
+        core = self.core
+        snake = core.snake
+        length = len(snake)
+        core.step(self.turns.pop(snake.direction))
+        if core.is_over:
+            return pack(END, core.state.value, core.ticks, snake.score, snake.length)
+        
+        # Same length after moving means the tail was dropped
+        flags = TAIL_REMOVED if len(snake) == length else 0
+        if core.food.is_bonus:
+            flags |= FOOD_BONUS
+        head_x, head_y = snake.get_head_position()
+        food_x, food_y = core.food.position
+        return pack(TICK, core.ticks, flags, head_x, head_y, food_x, food_y)
+
+
+class MatchServer:
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, write_limit=NET_WRITE_LIMIT):
+        self.host = host
+        self.port = port
+        self.write_limit = write_limit
+        self.matches = {difficulty: {} for difficulty in Difficulty}  # Running matches by id
+        self.stats = {'started': 0, 'finished': 0, 'dropped': 0, 'ticks': 0, 'late_ticks': 0}
+        self._ids = itertools.count(1)
+        self._boards = {}  # Matches on the same board size share one Board
+        self._server = None
+        self._tickers = []
+    
+    @property
+    def match_count(self):
+        return sum(len(matches) for matches in self.matches.values())
+    
+    async def start(self):
+        """Listen for clients and start the tickers; port 0 picks a free port"""
+        self._server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tickers = [asyncio.create_task(self.run_ticker(difficulty)) for difficulty in Difficulty]
+    
+    async def close(self):
+        for ticker in self._tickers:
+            ticker.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+    
+    def _start_match(self, writer, difficulty, width, height):
+        if difficulty not in (d.value for d in Difficulty):
+            raise ValueError(f"Unknown difficulty {difficulty}")
+        if not (2 <= width <= MAX_NET_BOARD_SIZE and 2 <= height <= MAX_NET_BOARD_SIZE):
+            raise ValueError(f"Board size {width}x{height} out of range")
+        board = self._boards.get((width, height))
+        if board is None:
+            board = self._boards[(width, height)] = Board(width, height, 0)
+        
+        match = Match(next(self._ids), board, Difficulty(difficulty), writer)
+        self.matches[match.difficulty][match.id] = match
+        self.stats['started'] += 1
+        writer.write(match.start_message())
+        return match
+    
+    async def handle_client(self, reader, writer):
+        """Read a client's JOIN and TURN messages until it disconnects"""
+        match = None
+        try:
+            message = await asyncio.wait_for(read_message(reader), NET_JOIN_TIMEOUT)
+            while True:
+                if message[0] == TURN:
+                    direction = _DIRECTIONS.get(message[1])
+                    if match is not None and direction is not None:
+                        match.turns.push(direction, match.core.snake.direction)
+                elif message[0] == JOIN:
+                    # A new match once the last one is over
+                    if match is None or match.core.is_over:
+                        match = self._start_match(writer, *message[1:])
+                else:
+                    raise ValueError(f"Unexpected message type {message[0]}")
+                message = await read_message(reader)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+        finally:
+            if match is not None:
+                self.matches[match.difficulty].pop(match.id, None)
+            writer.close()
+    
+    async def run_ticker(self, difficulty):
+        """Step every match of one difficulty at its speed"""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / snake_speed(difficulty)
+        matches = self.matches[difficulty]
+        deadline = loop.time()
+        while True:
+            deadline += interval
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Too far behind to catch up; move on from now instead of bursting
+                self.stats['late_ticks'] += 1
+                deadline = loop.time()
+                await asyncio.sleep(0)
+            
+            for match in list(matches.values()):
+                self._tick(matches, match)
+    
+    def _tick(self, matches, match):
+        writer = match.writer
+        if writer.is_closing():
+            del matches[match.id]
+            return
+        writer.write(match.tick())
+        self.stats['ticks'] += 1
+        if match.core.is_over:
+            del matches[match.id]
+            self.stats['finished'] += 1
+        elif writer.transport.get_write_buffer_size() > self.write_limit:
+            # The client stopped reading; drop it rather than buffer without bound
+            del matches[match.id]
+            self.stats['dropped'] += 1
+            writer.close()
+    
+    async def report(self, interval):
+        """Print match count, tick rate and CPU use every interval seconds"""
+        ticks = self.stats['ticks']
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        while True:
+            await asyncio.sleep(interval)
+            now_wall, now_cpu = time.perf_counter(), time.process_time()
+            elapsed = now_wall - wall
+            print(f"{self.match_count} matches, {(self.stats['ticks'] - ticks) / elapsed:,.0f} ticks/s, "
+                  f"CPU {(now_cpu - cpu) / elapsed:.0%}, started {self.stats['started']}, "
+                  f"finished {self.stats['finished']}, dropped {self.stats['dropped']}, "
+                  f"late ticks {self.stats['late_ticks']}", flush=True)
+            ticks, wall, cpu = self.stats['ticks'], now_wall, now_cpu
+
+
+async def serve(host=SERVER_HOST, port=SERVER_PORT, stats_interval=None):
+    server = MatchServer(host, port)
+    await server.start()
+    print(f"Serving Snake matches on {server.host}:{server.port}", flush=True)
+    try:
+        if stats_interval:
+            await server.report(stats_interval)
+        else:
+            await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Host networked Snake matches')
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--stats-interval', type=float, metavar='SECONDS',
+                        help='print match count, tick rate and CPU use this often')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
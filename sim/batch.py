@@ -0,0 +1,210 @@
+"""
+Vectorized batch simulator for Snake Game
+
+Steps N independent games in lockstep with NumPy. The rules mirror
+Snake.move(), Snake.grow() and the food handling in GameCore.step(), but
+nothing here imports pygame, so it can run on headless workers.
+"""
+import numpy as np
+
+from constants import BONUS_FOOD_CHANCE, BONUS_FOOD_GROWTH
+from models.enums import Direction
+from models.moves import WALL, move_table
+
+# Game status codes
+PLAYING = 0
+GAME_OVER = 1
+VICTORY = 2
+
+# Lookup table indexed by Direction value; index 0 means "no input"
+_OPPOSITE = np.array([
+    0,
+    Direction.DOWN.value,
+    Direction.UP.value,
+    Direction.RIGHT.value,
+    Direction.LEFT.value,
+], dtype=np.int8)
+
+# Random draws tried per respawn before falling back to an exact scan
+_SPAWN_ATTEMPTS = 8
+
+
+class BatchSnakeGame:
+    """N snake games stepped together by vectorized operations.
+    
+    Each body is a ring buffer of flat cell indices (y * width + x) in
+    ``body``, with ``head`` pointing at the head slot and ``body_len``
+    segments following it. ``occupancy`` is an (N, H, W) uint8 tensor and
+    ``direction`` an int8 vector of Direction values. An existing
+    ``occupancy`` array can be passed in, e.g. a view into an observation
+    buffer, and is then updated in place. ``bonus_chance`` is the chance
+    that new food is bonus food, as in GameCore.
+    """
+    
+    def __init__(self, num_games, width=10, height=10, seed=None, occupancy=None,
+                 bonus_chance=BONUS_FOOD_CHANCE):
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.bonus_chance = bonus_chance
+        self.rng = np.random.default_rng(seed)
+        
+        n = num_games
+        self.body = np.zeros((n, self.cells), dtype=np.int32)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.body_len = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        if occupancy is None:
+            occupancy = np.zeros((n, height, width), dtype=np.uint8)
+        elif occupancy.shape != (n, height, width) or occupancy.dtype != np.uint8:
+            raise ValueError(f"occupancy must be a ({n}, {height}, {width}) uint8 array")
+        self.occupancy = occupancy
+        self.direction = np.zeros(n, dtype=np.int8)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.food_is_bonus = np.zeros(n, dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.regular_food_eaten = np.zeros(n, dtype=np.int64)
+        self.bonus_food_eaten = np.zeros(n, dtype=np.int64)
+        self.status = np.zeros(n, dtype=np.int8)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        
+        # Next cell (or WALL) per Direction value and cell, from the shared move table
+        self._next_cell = np.full((len(Direction) + 1, self.cells), WALL, dtype=np.int32)
+        for direction, next_cell in move_table(width, height).next_cell.items():
+            self._next_cell[direction.value] = next_cell
+        
+        self._rows = np.arange(n)
+        self._occ = self.occupancy.reshape(n, self.cells)
+        if not np.may_share_memory(self._occ, self.occupancy):
+            raise ValueError("occupancy rows must be laid out so each board can be viewed flat")
+        self.reset()
+    
+    def reset(self, mask=None):
+        """Reset all games, or only those selected by a boolean mask"""
+        rows = self._rows if mask is None else np.flatnonzero(mask)
+        if rows.size == 0:
+            return
+        
+        start = (self.height // 2) * self.width + self.width // 2
+        self._occ[rows] = 0
+        self._occ[rows, start] = 1
+        self.body[rows, 0] = start
+        self.head[rows] = 0
+        self.body_len[rows] = 1
+        self.length[rows] = 1
+        self.direction[rows] = Direction.RIGHT.value
+        self.score[rows] = 0
+        self.regular_food_eaten[rows] = 0
+        self.bonus_food_eaten[rows] = 0
+        self.status[rows] = PLAYING
+        self.ticks[rows] = 0
+        self.food_is_bonus[rows] = False
+        self.food[rows] = self._sample_free(rows)
+    
+    def step(self, actions=None):
+        """Advance every running game by one tick.
+        
+        ``actions`` is an optional int array of Direction values (0 keeps
+        the current direction). Returns ``(ate, finished)`` boolean arrays
+        marking games that ate food or ended on this tick.
+        """
+        playing = self.status == PLAYING
+        
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int8)
+            # Prevent 180-degree turns, as in Snake.change_direction()
+            turn = playing & (actions != 0) & (actions != _OPPOSITE[self.direction])
+            self.direction[turn] = actions[turn]
+        
+        rows = np.flatnonzero(playing)
+        self.ticks[rows] += 1
+        
+        heads = self.body[rows, self.head[rows]]
+        cell = self._next_cell[self.direction[rows], heads]
+        
+        # Wall and self collisions; the tail still counts as it has not moved yet
+        wall = cell == WALL
+        cell[wall] = 0
+        dead = wall | (self._occ[rows, cell] != 0)
+        
+        finished = np.zeros(self.num_games, dtype=bool)
+        finished[rows[dead]] = True
+        self.status[rows[dead]] = GAME_OVER
+        
+        movers = rows[~dead]
+        cell = cell[~dead]
+        
+        # Push the new head
+        head = (self.head[movers] - 1) % self.cells
+        self.head[movers] = head
+        self.body[movers, head] = cell
+        self._occ[movers, cell] = 1
+        self.body_len[movers] += 1
+        
+        # Remove the tail if not growing
+        shrink = movers[self.body_len[movers] > self.length[movers]]
+        tail = (self.head[shrink] + self.body_len[shrink] - 1) % self.cells
+        self._occ[shrink, self.body[shrink, tail]] = 0
+        self.body_len[shrink] -= 1
+        
+        # Victory check happens before eating, as in Game.update()
+        won = self.length[movers] >= self.cells - 1
+        finished[movers[won]] = True
+        self.status[movers[won]] = VICTORY
+        movers = movers[~won]
+        cell = cell[~won]
+        
+        eaters = movers[cell == self.food[movers]]
+        ate = np.zeros(self.num_games, dtype=bool)
+        ate[eaters] = True
+        
+        bonus = self.food_is_bonus[eaters]
+        amount = np.where(bonus, BONUS_FOOD_GROWTH, 1)
+        self.length[eaters] += amount
+        self.score[eaters] += 10 * amount
+        self.bonus_food_eaten[eaters] += bonus
+        self.regular_food_eaten[eaters] += ~bonus
+        
+        # No space left for food means the game is won
+        full = self.body_len[eaters] >= self.cells
+        finished[eaters[full]] = True
+        self.status[eaters[full]] = VICTORY
+        
+        respawn = eaters[~full]
+        self.food[respawn] = self._sample_free(respawn)
+        self.food_is_bonus[respawn] = self.rng.random(respawn.size) < self.bonus_chance
+        
+        return ate, finished
+    
+    def _sample_free(self, rows):
+        """Pick a uniformly random free cell for each game in ``rows``"""
+        result = np.full(rows.size, -1, dtype=np.int64)
+        pending = np.arange(rows.size)
+        
+        # Rejection sampling is cheap while the boards are mostly empty
+        for _ in range(_SPAWN_ATTEMPTS):
+            if pending.size == 0:
+                return result
+            guess = self.rng.integers(0, self.cells, pending.size)
+            hit = self._occ[rows[pending], guess] == 0
+            result[pending[hit]] = guess[hit]
+            pending = pending[~hit]
+        
+        if pending.size:
+            # Exact fallback: choose the k-th free cell of each remaining board
+            free = self._occ[rows[pending]] == 0
+            counts = free.sum(axis=1)
+            k = (self.rng.random(pending.size) * counts).astype(np.int64)
+            result[pending] = np.argmax(np.cumsum(free, axis=1) > k[:, None], axis=1)
+        return result
+    
+    def positions(self, index):
+        """Body of one game as a list of (x, y) tuples, head first"""
+        slots = (self.head[index] + np.arange(self.body_len[index])) % self.cells
+        return [(int(cell % self.width), int(cell // self.width))
+                for cell in self.body[index, slots]]
+    
+    def food_position(self, index):
+        cell = int(self.food[index])
+        return (cell % self.width, cell // self.width)
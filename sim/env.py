@@ -0,0 +1,239 @@
+"""
+Reinforcement-learning environments for Snake Game
+
+SnakeEnv plays one game on GameCore and VecSnakeEnv steps many games at
+once on BatchSnakeGame, resetting each one as soon as it ends. Both use
+the Gym reset()/step() interface: step() returns (observation, reward,
+terminated, truncated, info).
+
+Actions are Direction values, with 0 (or None) to keep going. The reward
+is the score gained on the tick (10 points per cell of growth, as in
+Snake.grow()), plus GAME_OVER_REWARD or VICTORY_REWARD when the game ends.
+
+Observations are written into arrays allocated once per environment and
+returned without copying, so they are overwritten by the next step; copy
+them to keep them. Two kinds are available:
+
+- 'planes': uint8 planes of shape (3, height, width), holding the body,
+  the head and the food. VecSnakeEnv's body planes are the batch
+  simulator's own occupancy grids, so they never need copying.
+- 'features': a float32 vector of FEATURE_SIZE values. These are danger
+  one step up, down, left and right; the current direction, one-hot in
+  the same order; the food's x and y offset from the head as a fraction
+  of the board; and the snake's length as a fraction of the board.
+
+Nothing here imports pygame.
+"""
+import random
+
+import numpy as np
+
+from constants import BONUS_FOOD_CHANCE
+from models.board import Board
+from models.core import GameCore, SEED_BITS
+from models.enums import Direction, GameState
+from models.moves import WALL, move_table
+from sim.batch import BatchSnakeGame, GAME_OVER, VICTORY
+
+OBSERVATIONS = ('planes', 'features')
+FEATURE_SIZE = 11
+
+GAME_OVER_REWARD = -10.0
+VICTORY_REWARD = 100.0
+
+# Actions by Direction value; 0 keeps the current direction
+_ACTIONS = [None] + sorted(Direction, key=lambda direction: direction.value)
+
+def _check_observation(observation):
+    if observation not in OBSERVATIONS:
+        raise ValueError(f"Unknown observation {observation!r}, choose from {', '.join(OBSERVATIONS)}")
+
+def observation_shape(observation, width, height):
+    _check_observation(observation)
+    return (3, height, width) if observation == 'planes' else (FEATURE_SIZE,)
+
+
+class SnakeEnv:
+    """One game of Snake behind a Gym-style interface"""
+    
+    def __init__(self, width=10, height=10, seed=None, observation='planes', max_ticks=None,
+                 bonus_chance=BONUS_FOOD_CHANCE, game_over_reward=GAME_OVER_REWARD,
+                 victory_reward=VICTORY_REWARD):
+        _check_observation(observation)
+        self.board = Board(width, height, 0)
+        self.observation = observation
+        self.observation_shape = observation_shape(observation, width, height)
+        self.max_ticks = self.board.cells * self.board.cells if max_ticks is None else max_ticks
+        self.game_over_reward = game_over_reward
+        self.victory_reward = victory_reward
+        self._seeds = random.Random(seed)  # Each game gets its own seed from this stream
+        self.core = GameCore(self.board, 0, bonus_chance)
+        self._move_table = move_table(width, height)
+        self._planes = np.zeros((3, height, width), dtype=np.uint8)
+        self._features = np.zeros(FEATURE_SIZE, dtype=np.float32)
+    
+    def reset(self, seed=None):
+        """Start a new game; returns (observation, info)"""
+        if seed is None:
+            seed = self._seeds.getrandbits(SEED_BITS)
+        self.core.reset(seed)
+        # A view of the new snake's occupancy grid, so the body plane is a single copy
+        self._occupancy = np.frombuffer(self.core.snake.occupancy, dtype=np.uint8)
+        self._planes[1:] = 0
+        self._marked = None
+        return self._observe(), self._info([])
+    
+    def step(self, action):
+        """Play one tick; returns (observation, reward, terminated, truncated, info)"""
+        core = self.core
+        if not isinstance(action, Direction) and action is not None:
+            action = _ACTIONS[action]
+        score = core.snake.score
+        events = core.step(action)
+        
+        reward = float(core.snake.score - score)
+        if core.state == GameState.GAME_OVER:
+            reward += self.game_over_reward
+        elif core.state == GameState.VICTORY:
+            reward += self.victory_reward
+        terminated = core.is_over
+        truncated = not terminated and core.ticks >= self.max_ticks
+        return self._observe(), reward, terminated, truncated, self._info(events)
+    
+    def _info(self, events):
+        snake = self.core.snake
+        return {'score': snake.score, 'length': snake.length, 'ticks': self.core.ticks, 'events': events}
+    
+    def _observe(self):
+        snake = self.core.snake
+        head_x, head_y = snake.get_head_position()
+        food_x, food_y = self.core.food.position
+        
+        if self.observation == 'planes':
+            planes = self._planes
+            planes[0].reshape(-1)[:] = self._occupancy
+            if self._marked is not None:
+                old_head_x, old_head_y, old_food_x, old_food_y = self._marked
+                planes[1, old_head_y, old_head_x] = 0
+                planes[2, old_food_y, old_food_x] = 0
+            planes[1, head_y, head_x] = 1
+            planes[2, food_y, food_x] = 1
+            self._marked = (head_x, head_y, food_x, food_y)
+            return planes
+        
+        features = self._features
+        width, height = self.board.width, self.board.height
+        occupied = snake.occupancy
+        head = snake.head_cell
+        for i, next_cell in enumerate(self._move_table.next_cell.values()):
+            cell = next_cell[head]
+            features[i] = cell == WALL or occupied[cell]
+        features[4:8] = 0
+        features[3 + snake.direction.value] = 1
+        features[8] = (food_x - head_x) / width
+        features[9] = (food_y - head_y) / height
+        features[10] = snake.length / self.board.cells
+        return features
+
+
+class VecSnakeEnv:
+    """num_envs games of Snake stepped together, each reset as soon as it ends.
+    
+    Observations, rewards and flags are arrays with one row per game.
+    The info dict holds final_score and final_length, which are set for
+    the games that ended on the last step.
+    """
+    
+    def __init__(self, num_envs, width=10, height=10, seed=None, observation='planes', max_ticks=None,
+                 bonus_chance=BONUS_FOOD_CHANCE, game_over_reward=GAME_OVER_REWARD,
+                 victory_reward=VICTORY_REWARD):
+        _check_observation(observation)
+        self.num_envs = num_envs
+        self.observation = observation
+        self.observation_shape = (num_envs,) + observation_shape(observation, width, height)
+        cells = width * height
+        self.max_ticks = cells * cells if max_ticks is None else max_ticks
+        self.game_over_reward = game_over_reward
+        self.victory_reward = victory_reward
+        
+        # The simulator keeps its boards straight in the body planes
+        self._planes = np.zeros((num_envs, 3, height, width), dtype=np.uint8)
+        self.game = BatchSnakeGame(
+            num_envs, width, height, seed, occupancy=self._planes[:, 0], bonus_chance=bonus_chance
+        )
+        self._occupancy = self.game.occupancy.reshape(num_envs, cells)
+        self._head_plane = self._planes[:, 1].reshape(num_envs, cells)
+        self._food_plane = self._planes[:, 2].reshape(num_envs, cells)
+        self._features = np.zeros((num_envs, FEATURE_SIZE), dtype=np.float32)
+        
+        self._next_cells = [
+            np.frombuffer(next_cell, dtype=np.intc) for next_cell in move_table(width, height).next_cell.values()
+        ]
+        self._rows = np.arange(num_envs)
+        self._heads = np.zeros(num_envs, dtype=np.int64)  # Cells marked in the head and food planes
+        self._foods = np.zeros(num_envs, dtype=np.int64)
+        self._last_score = np.zeros(num_envs, dtype=np.int64)
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self.final_score = np.zeros(num_envs, dtype=np.int64)
+        self.final_length = np.zeros(num_envs, dtype=np.int64)
+    
+    def reset(self):
+        """Start every game over; returns (observations, info)"""
+        self.game.reset()
+        self._mark()
+        return self._observe(), self._info()
+    
+    def step(self, actions=None):
+        """Play one tick of every game; returns (observations, rewards, terminated, truncated, info)"""
+        game = self.game
+        np.copyto(self._last_score, game.score)
+        _, terminated = game.step(actions)
+        
+        rewards = self._rewards
+        np.subtract(game.score, self._last_score, out=rewards, casting='unsafe')
+        rewards[terminated & (game.status == GAME_OVER)] += self.game_over_reward
+        rewards[terminated & (game.status == VICTORY)] += self.victory_reward
+        truncated = ~terminated & (game.ticks >= self.max_ticks)
+        
+        # Note how the finished games ended, then start them over
+        done = terminated | truncated
+        self.final_score[done] = game.score[done]
+        self.final_length[done] = game.length[done]
+        game.reset(done)
+        
+        self._mark()
+        return self._observe(), rewards, terminated, truncated, self._info()
+    
+    def _info(self):
+        return {'final_score': self.final_score, 'final_length': self.final_length}
+    
+    def _mark(self):
+        """Move the head and food marks to where they are now"""
+        game = self.game
+        rows = self._rows
+        self._head_plane[rows, self._heads] = 0
+        self._food_plane[rows, self._foods] = 0
+        self._heads[:] = game.body[rows, game.head]
+        self._foods[:] = game.food
+        self._head_plane[rows, self._heads] = 1
+        self._food_plane[rows, self._foods] = 1
+    
+    def _observe(self):
+        if self.observation == 'planes':
+            return self._planes
+        
+        game = self.game
+        width, height = game.width, game.height
+        features = self._features
+        x = self._heads % width
+        y = self._heads // width
+        for i, next_cell in enumerate(self._next_cells):
+            cell = next_cell[self._heads]
+            wall = cell == WALL
+            features[:, i] = wall | (self._occupancy[self._rows, np.where(wall, 0, cell)] != 0)
+        features[:, 4:8] = 0
+        features[self._rows, 3 + game.direction] = 1
+        features[:, 8] = (self._foods % width - x) / width
+        features[:, 9] = (self._foods // width - y) / height
+        features[:, 10] = game.length / game.cells
+        return features
@@ -0,0 +1,190 @@
+"""
+Self-play farm for Snake Game
+
+Plays large numbers of headless games with a scripted policy across a
+process pool. Game i of a run is seeded from the run seed and i alone,
+so results do not depend on the number of workers or the batch size.
+Each worker plays a batch of games and sends back one small NumPy array
+per column. The columns are concatenated in game order and written to a
+compressed .npz file, and summarized per difficulty.
+
+    python -m sim.farm --games 100000 --policy greedy --out farm.npz
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from ai.hamiltonian import hamiltonian_cycle
+from constants import BONUS_FOOD_CHANCE
+from models.board import Board
+from models.core import GameCore, SEED_BITS
+from models.enums import Difficulty, GameState
+from sim.policies import POLICIES
+
+# Result columns and their types; outcome is a GameState value, where
+# PLAYING means the game was cut off at max_ticks
+COLUMNS = {
+    'seed': np.uint64,
+    'difficulty': np.int8,
+    'outcome': np.int8,
+    'score': np.int32,
+    'length': np.int32,
+    'ticks': np.int32,
+    'regular_food': np.int32,
+    'bonus_food': np.int32,
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+def game_seed(run_seed, index):
+    """Seed of game `index` in a run"""
+    return random.Random(run_seed * 1_000_003 + index).getrandbits(SEED_BITS)
+
+def play_batch(policy_name, width, height, run_seed, difficulties, start, stop,
+               bonus_chance=BONUS_FOOD_CHANCE, max_ticks=None):
+    """Play games start..stop-1 and return their results as a dict of columns"""
+    board = Board(width, height, 0)
+    if max_ticks is None:
+        max_ticks = board.cells * board.cells
+    columns = {name: np.zeros(stop - start, dtype=dtype) for name, dtype in COLUMNS.items()}
+    rng = random.Random()
+    policy = POLICIES[policy_name](rng)
+    
+    for row, index in enumerate(range(start, stop)):
+        seed = game_seed(run_seed, index)
+        rng.seed(seed + 1)  # The policy's own stream, separate from the game's
+        core = GameCore(board, seed, bonus_chance)
+        policy.reset(core)
+        
+        step = core.step
+        while not core.is_over and core.ticks < max_ticks:
+            step(policy(core))
+        
+        snake = core.snake
+        columns['seed'][row] = seed
+        columns['difficulty'][row] = difficulties[index % len(difficulties)]
+        columns['outcome'][row] = core.state.value
+        columns['score'][row] = snake.score
+        columns['length'][row] = snake.length
+        columns['ticks'][row] = core.ticks
+        columns['regular_food'][row] = snake.regular_food_eaten
+        columns['bonus_food'][row] = snake.bonus_food_eaten
+    return start, columns
+
+def run_farm(games, policy='greedy', width=10, height=10, seed=0, workers=None,
+             batch_size=DEFAULT_BATCH_SIZE, difficulties=tuple(Difficulty),
+             bonus_chance=BONUS_FOOD_CHANCE, max_ticks=None, progress=None):
+    """Play `games` games over a process pool and return the result columns in game order.
+    
+    Games are spread round-robin over the given difficulties. progress,
+    if given, is called with the number of games finished so far.
+    """
+    difficulties = [difficulty.value for difficulty in difficulties]
+    parts = []
+    done = 0
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(play_batch, policy, width, height, seed, difficulties,
+                        start, min(start + batch_size, games), bonus_chance, max_ticks)
+            for start in range(0, games, batch_size)
+        ]
+        for future in as_completed(futures):
+            start, columns = future.result()
+            parts.append((start, columns))
+            done += len(columns['seed'])
+            if progress is not None:
+                progress(done)
+    
+    parts.sort(key=lambda part: part[0])
+    return {
+        name: np.concatenate([columns[name] for _, columns in parts]) if parts else np.zeros(0, dtype)
+        for name, dtype in COLUMNS.items()
+    }
+
+def summarize(columns):
+    """Score, length, survival and food statistics per difficulty name"""
+    summary = {}
+    for difficulty in Difficulty:
+        mask = columns['difficulty'] == difficulty.value
+        games = int(mask.sum())
+        if not games:
+            continue
+        stats = {
+            'games': games,
+            'victory_rate': float(np.mean(columns['outcome'][mask] == GameState.VICTORY.value)),
+            'cut_off': int(np.sum(columns['outcome'][mask] == GameState.PLAYING.value)),
+        }
+        for name in ('score', 'length', 'ticks'):
+            values = columns[name][mask]
+            stats[name] = {
+                'mean': float(values.mean()),
+                'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)),
+                'max': int(values.max()),
+            }
+        regular = columns['regular_food'][mask]
+        bonus = columns['bonus_food'][mask]
+        eaten = int(regular.sum() + bonus.sum())
+        stats['food'] = {
+            'regular_mean': float(regular.mean()),
+            'bonus_mean': float(bonus.mean()),
+            'bonus_share': float(bonus.sum() / eaten) if eaten else 0.0,
+        }
+        summary[difficulty.name] = stats
+    return summary
+
+def save(filename, columns, settings):
+    """Write the columns to a compressed .npz file, with the run settings as JSON"""
+    np.savez_compressed(filename, settings=np.array(json.dumps(settings)), **columns)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play Snake games with a scripted policy')
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--width', type=int, default=10)
+    parser.add_argument('--height', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='games per worker task')
+    parser.add_argument('--difficulty', choices=['all'] + [d.name.lower() for d in Difficulty], default='all')
+    parser.add_argument('--bonus-chance', type=float, default=BONUS_FOOD_CHANCE)
+    parser.add_argument('--max-ticks', type=int, help='cut games off after this many ticks (default: cells squared)')
+    parser.add_argument('--out', metavar='FILE', help='write the per-game results to a .npz file')
+    args = parser.parse_args(argv)
+    if args.policy == 'hamiltonian':
+        # Checked here, so an unfit board is not reported from inside every worker
+        try:
+            hamiltonian_cycle(args.width, args.height)
+        except ValueError as error:
+            parser.error(str(error))
+    
+    if args.difficulty == 'all':
+        difficulties = tuple(Difficulty)
+    else:
+        difficulties = (Difficulty[args.difficulty.upper()],)
+    
+    start = time.perf_counter()
+    columns = run_farm(
+        args.games, args.policy, args.width, args.height, args.seed, args.workers,
+        args.batch_size, difficulties, args.bonus_chance, args.max_ticks
+    )
+    elapsed = time.perf_counter() - start
+    ticks = int(columns['ticks'].sum())
+    print(f"{args.games} games, {ticks} ticks in {elapsed:.2f}s "
+          f"({args.games / elapsed:,.0f} games/s, {ticks / elapsed:,.0f} ticks/s) on {args.workers} workers")
+    
+    summary = summarize(columns)
+    print(json.dumps(summary, indent=2))
+    
+    if args.out:
+        settings = {key: value for key, value in vars(args).items() if key != 'out'}
+        save(args.out, columns, dict(settings, summary=summary))
+        print(f"Results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Scripted players for Snake Game self-play
+
+A policy is called once per tick with the GameCore it plays and returns
+the Direction to turn to, or None to keep going. reset() is called
+before each new game.
+"""
+from ai.autopilot import Autopilot
+from ai.hamiltonian import hamiltonian_cycle, cycle_directions
+from models.enums import DIRECTION_STEPS, OPPOSITE_DIRECTION
+
+class RandomPolicy:
+    """Turns at random, never straight back into its neck"""
+    name = 'random'
+    
+    def __init__(self, rng):
+        self.rng = rng
+    
+    def reset(self, core):
+        pass
+    
+    def __call__(self, core):
+        opposite = OPPOSITE_DIRECTION[core.snake.direction]
+        return self.rng.choice([direction for direction in DIRECTION_STEPS if direction != opposite])
+
+
+class GreedyPolicy:
+    """Takes the safe neighbouring cell closest to the food, breaking ties at random"""
+    name = 'greedy'
+    
+    def __init__(self, rng):
+        self.rng = rng
+    
+    def reset(self, core):
+        pass
+    
+    def __call__(self, core):
+        snake = core.snake
+        width = core.board.width
+        food_x, food_y = core.food.position
+        occupied = snake.occupancy
+        opposite = OPPOSITE_DIRECTION[snake.direction]
+        best = None
+        best_key = None
+        for direction, cell in core.board.move_table.neighbors(snake.head_cell):
+            if direction is opposite or occupied[cell]:
+                continue
+            key = (abs(food_x - cell % width) + abs(food_y - cell // width), self.rng.random())
+            if best_key is None or key < best_key:
+                best, best_key = direction, key
+        return best
+
+
+class HamiltonianPolicy:
+    """Follows a cycle through every cell, which always ends in victory"""
+    name = 'hamiltonian'
+    
+    def __init__(self, rng=None):
+        self._board = None
+    
+    def reset(self, core):
+        board = core.board
+        if board is not self._board:
+            cells = hamiltonian_cycle(board.width, board.height)
+            self._index = {cell: i for i, cell in enumerate(cells)}
+            # Directions out of each cell going round the cycle forwards and backwards
+            self._directions = (cycle_directions(cells), cycle_directions(cells[::-1])[::-1])
+            self._board = board
+        
+        # Go round whichever way does not start by reversing the snake
+        i = self._index[core.snake.get_head_position()]
+        opposite = OPPOSITE_DIRECTION[core.snake.direction]
+        self._path = self._directions[0] if self._directions[0][i] != opposite else self._directions[1]
+    
+    def __call__(self, core):
+        return self._path[self._index[core.snake.get_head_position()]]
+
+
+POLICIES = {policy.name: policy for policy in (RandomPolicy, GreedyPolicy, HamiltonianPolicy, Autopilot)}
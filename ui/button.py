@@ -2,23 +2,26 @@
 Button class for Snake Game UI
 """
 import pygame
-from constants import BLACK
+from constants import BLACK, FONT_SIZE
+from ui.text import render, get_font
 
 class Button:
+    __slots__ = ('rect', 'text', 'color', 'hover_color', 'is_hovered', 'font')
+    
     def __init__(self, x, y, width, height, text, color, hover_color):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.color = color
         self.hover_color = hover_color
         self.is_hovered = False
-        self.font = pygame.font.SysFont('Arial', 24)
+        self.font = get_font(FONT_SIZE)  # Shared by every button
     
     def draw(self, surface):
         color = self.hover_color if self.is_hovered else self.color
         pygame.draw.rect(surface, color, self.rect)
         pygame.draw.rect(surface, BLACK, self.rect, 2)  # Border
         
-        text_surface = self.font.render(self.text, True, BLACK)
+        text_surface = render(self.font, self.text, BLACK)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
     
@@ -0,0 +1,173 @@
+"""
+Incremental renderer for the Snake Game board
+"""
+from collections import deque
+from itertools import islice
+
+import pygame
+from constants import BLACK
+from ui import sprites
+from ui.text import render
+
+class BoardRenderer:
+    """Draws the PLAYING screen by redrawing only the cells that changed.
+    
+    The board (background, grid, snake and food, without the HUD) is kept
+    on an offscreen surface. Each frame only the new head cells, vacated
+    tail cells and old/new food cells are redrawn on it and copied to the
+    screen, then the HUD text touching those areas is drawn on top.
+    draw() returns the list of changed rects for pygame.display.update(),
+    or None when the whole screen was redrawn.
+    """
+    
+    def __init__(self, surface, font, small_font, board):
+        self.surface = surface
+        self.font = font
+        self.small_font = small_font
+        self.board_config = board
+        if board.level is None:
+            self.background = sprites.background(*surface.get_size(), board.cell_size)
+        else:
+            self.background = sprites.level_background(*surface.get_size(), board.cell_size, board.level)
+        self.board = self.background.copy()
+        self.invalidate()
+    
+    def invalidate(self):
+        """Force a full redraw on the next frame (e.g. after another screen was shown)"""
+        self._snake = None
+        self._body = deque()
+        self._moves = 0
+        self._food = None
+        self._hud = {}
+    
+    def draw(self, snake, food, score, game_time, difficulty):
+        hud = self._layout_hud(snake, score, game_time, difficulty)
+        
+        moved = snake.moves - self._moves
+        if snake is not self._snake or moved < 0 or moved > len(snake):
+            self._redraw_all(snake, food, hud)
+            return None
+        
+        dirty_cells = set()
+        
+        # The body is a path that only advances: after `moved` steps it is the
+        # new head cells followed by the first len(snake) - moved old cells,
+        # so everything past that in our copy has been vacated by the tail
+        new_heads = list(islice(snake.iter_positions(), moved))
+        keep = len(snake) - moved
+        while len(self._body) > keep:
+            dirty_cells.add(self._body.pop())
+        self._body.extendleft(reversed(new_heads))
+        dirty_cells.update(new_heads)
+        self._moves = snake.moves
+        
+        food_state = (food.position, food.is_bonus)
+        if food_state != self._food:
+            if self._food is not None:
+                dirty_cells.add(self._food[0])
+            dirty_cells.add(food.position)
+            self._food = food_state
+        
+        dirty = []
+        for position in dirty_cells:
+            dirty.append(self._draw_cell(snake, food, position))
+        
+        # HUD text overlaps the board, so redraw every label whose text
+        # changed or whose area was touched, together with its old area
+        redraw_hud = []
+        pending = True
+        while pending:
+            pending = False
+            for key, (surface, rect) in hud.items():
+                if key in redraw_hud:
+                    continue
+                previous = self._hud.get(key)
+                changed = previous is None or previous[0] is not surface
+                if changed or rect.collidelist(dirty) != -1:
+                    redraw_hud.append(key)
+                    dirty.append(rect)
+                    if previous is not None:
+                        dirty.append(previous[1])
+                    pending = True
+        
+        for rect in dirty:
+            self.surface.blit(self.board, rect, rect)
+        for key, (surface, rect) in hud.items():
+            if key in redraw_hud:
+                self.surface.blit(surface, rect)
+        self._hud = hud
+        
+        return dirty
+    
+    def _draw_cell(self, snake, food, position):
+        x, y = position
+        size = self.board_config.cell_size
+        rect = pygame.Rect(x * size, y * size, size, size)
+        self.board.blit(self.background, rect, rect)
+        if snake.occupies(position):
+            snake.draw_segment(self.board, position)
+        if position == food.position:
+            # Food goes on top, as in a full redraw (the head is on it when the game is won)
+            food.draw(self.board)
+        return rect
+    
+    def _redraw_all(self, snake, food, hud):
+        self.board.blit(self.background, (0, 0))
+        snake.draw(self.board)
+        food.draw(self.board)
+        self.surface.blit(self.board, (0, 0))
+        for surface, rect in hud.values():
+            self.surface.blit(surface, rect)
+        
+        self._snake = snake
+        self._body = deque(snake.iter_positions())
+        self._moves = snake.moves
+        self._food = (food.position, food.is_bonus)
+        self._hud = hud
+    
+    def _layout_hud(self, snake, score, game_time, difficulty):
+        """Render the HUD labels; unchanged text comes back as the same cached surface"""
+        screen_width, screen_height = self.surface.get_size()
+        labels = {
+            'score': (self.font, f'Score: {score}', 'topleft', (10, 10)),
+            'time': (self.font, f'Time: {int(game_time)}s', 'midtop', (screen_width // 2, 10)),
+            'difficulty': (self.font, f'Difficulty: {difficulty.name}', 'topright', (screen_width - 10, 10)),
+            'food': (
+                self.small_font,
+                f'Regular: {snake.regular_food_eaten} | Bonus: {snake.bonus_food_eaten}',
+                'bottomleft',
+                (10, screen_height - 10)
+            ),
+        }
+        
+        hud = {}
+        for key, (font, text, anchor, pos) in labels.items():
+            surface = render(font, text, BLACK)
+            hud[key] = (surface, surface.get_rect(**{anchor: pos}))
+        return hud
+
+
+class SnapshotScreen:
+    """Presents a screen that is composed once and then stays static.
+    
+    Used for the game over and victory screens: the first frame draws the
+    final board with the overlay and text on top, and keeps a copy of the
+    result. Later frames just blit that copy until the key changes, so no
+    surfaces are allocated or redrawn per frame.
+    """
+    
+    def __init__(self, surface):
+        self.surface = surface
+        self.snapshot = surface.copy()
+        self._key = None
+    
+    def invalidate(self):
+        self._key = None
+    
+    def draw(self, key, compose):
+        if key != self._key:
+            compose()
+            self.snapshot.blit(self.surface, (0, 0))
+            self._key = key
+        else:
+            self.surface.blit(self.snapshot, (0, 0))
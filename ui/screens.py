@@ -4,31 +4,44 @@ Screen rendering functions for Snake Game
 import pygame
 import time
 from constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, GRAY, GOLD,
-    FONT, SMALL_FONT, BIG_FONT
+    WHITE, BLACK, GOLD, FONT_SIZE, SMALL_FONT_SIZE, BIG_FONT_SIZE, PROFILE_FONT_SIZE
 )
-from models.enums import GameState
+from ui import sprites
+from ui.text import render, get_font
 
-def draw_grid(surface, grid_size):
-    """Draw the game grid"""
-    for x in range(0, SCREEN_WIDTH, grid_size):
-        pygame.draw.line(surface, GRAY, (x, 0), (x, SCREEN_HEIGHT))
-    for y in range(0, SCREEN_HEIGHT, grid_size):
-        pygame.draw.line(surface, GRAY, (0, y), (SCREEN_WIDTH, y))
+# Memoized screen layouts: name -> (inputs, layout)
+_layouts = {}
+
+def _layout(name, inputs, build):
+    """Return the cached result of build() for a screen, rebuilding it only when inputs change"""
+    cached = _layouts.get(name)
+    if cached is None or cached[0] != inputs:
+        cached = _layouts[name] = (inputs, build())
+    return cached[1]
+
+def clear_layouts():
+    """Drop all memoized screen layouts"""
+    _layouts.clear()
 
 def draw_menu(surface, big_font, font, buttons):
     """Draw the main menu screen"""
-    surface.fill(WHITE)
-    
-    # Draw title
-    title_text = big_font.render('Snake Game', True, BLACK)
-    title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
-    surface.blit(title_text, title_rect)
-    
-    # Draw subtitle
-    subtitle_text = font.render('Select Difficulty:', True, BLACK)
-    subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-    surface.blit(subtitle_text, subtitle_rect)
+    screen_width, screen_height = surface.get_size()
+    def build():
+        background = pygame.Surface((screen_width, screen_height))
+        background.fill(WHITE)
+        
+        # Draw title
+        title_text = render(big_font, 'Snake Game', BLACK)
+        title_rect = title_text.get_rect(center=(screen_width // 2, screen_height // 4))
+        background.blit(title_text, title_rect)
+        
+        # Draw subtitle
+        subtitle_text = render(font, 'Select Difficulty:', BLACK)
+        subtitle_rect = subtitle_text.get_rect(center=(screen_width // 2, screen_height // 3))
+        background.blit(subtitle_text, subtitle_rect)
+        return background
+    
+    surface.blit(_layout('menu', ((screen_width, screen_height), big_font, font), build), (0, 0))
     
     # Draw buttons
     for button in buttons:
@@ -36,6 +49,7 @@ def draw_menu(surface, big_font, font, buttons):
 
 def draw_countdown(surface, big_font, font, start_time, duration):
     """Draw the countdown screen"""
+    screen_width, screen_height = surface.get_size()
     surface.fill(WHITE)
     
     # Calculate remaining time
@@ -44,163 +58,156 @@ def draw_countdown(surface, big_font, font, start_time, duration):
     countdown_text = str(int(remaining) + 1)
     
     # Draw countdown
-    text_surface = big_font.render(countdown_text, True, BLACK)
-    text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+    text_surface = render(big_font, countdown_text, BLACK)
+    text_rect = text_surface.get_rect(center=(screen_width // 2, screen_height // 2))
     surface.blit(text_surface, text_rect)
     
     # Draw "Get Ready!" text
-    ready_text = font.render("Get Ready!", True, BLACK)
-    ready_rect = ready_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
+    ready_text = render(font, "Get Ready!", BLACK)
+    ready_rect = ready_text.get_rect(center=(screen_width // 2, screen_height // 3))
     surface.blit(ready_text, ready_rect)
 
-def draw_game(surface, grid_size, snake, food, score, game_time, difficulty):
-    """Draw the main game screen"""
-    surface.fill(WHITE)
-    draw_grid(surface, grid_size)
-    snake.draw(surface)
-    food.draw(surface)
-    
-    # Draw score
-    score_text = FONT.render(f'Score: {score}', True, BLACK)
-    surface.blit(score_text, (10, 10))
-    
-    # Draw time
-    time_text = FONT.render(f'Time: {int(game_time)}s', True, BLACK)
-    time_rect = time_text.get_rect(midtop=(SCREEN_WIDTH // 2, 10))
-    surface.blit(time_text, time_rect)
-    
-    # Draw difficulty
-    diff_text = FONT.render(f'Difficulty: {difficulty.name}', True, BLACK)
-    diff_rect = diff_text.get_rect(topright=(SCREEN_WIDTH - 10, 10))
-    surface.blit(diff_text, diff_rect)
-    
-    # Draw food count
-    food_text = SMALL_FONT.render(
-        f'Regular: {snake.regular_food_eaten} | Bonus: {snake.bonus_food_eaten}', 
-        True, BLACK
-    )
-    food_rect = food_text.get_rect(bottomleft=(10, SCREEN_HEIGHT - 10))
-    surface.blit(food_text, food_rect)
+def _final_stats_layout(surface, title, title_color, snake, game_time):
+    """Text blits shared by the game over and victory screens"""
+    screen_width, screen_height = surface.get_size()
+    def build():
+        layout = []
+        
+        # Draw the headline message
+        title_text = render(get_font(BIG_FONT_SIZE), title, title_color)
+        layout.append((title_text, title_text.get_rect(center=(screen_width // 2, screen_height // 2 - 60))))
+        
+        # Draw final score
+        score_text = render(get_font(FONT_SIZE), f'Final Score: {snake.score}', WHITE)
+        layout.append((score_text, score_text.get_rect(center=(screen_width // 2, screen_height // 2 - 10))))
+        
+        # Draw time played
+        time_text = render(get_font(FONT_SIZE), f'Time: {int(game_time)}s', WHITE)
+        layout.append((time_text, time_text.get_rect(center=(screen_width // 2, screen_height // 2 + 20))))
+        
+        # Draw food eaten
+        food_text = render(
+            get_font(FONT_SIZE),
+            f'Food: {snake.regular_food_eaten} regular, {snake.bonus_food_eaten} bonus',
+            WHITE
+        )
+        layout.append((food_text, food_text.get_rect(center=(screen_width // 2, screen_height // 2 + 50))))
+        
+        # Draw restart instruction
+        restart_text = render(get_font(FONT_SIZE), 'Press R to restart or M for menu', WHITE)
+        layout.append((restart_text, restart_text.get_rect(center=(screen_width // 2, screen_height // 2 + 90))))
+        return layout
+    
+    inputs = (surface.get_size(), title, snake.score, int(game_time), snake.regular_food_eaten, snake.bonus_food_eaten)
+    return _layout('final_stats', inputs, build)
 
 def draw_game_over(surface, snake, game_time):
     """Draw the game over screen"""
+    screen_width, screen_height = surface.get_size()
     # Draw semi-transparent overlay
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 128))  # Semi-transparent black
+    overlay = sprites.overlay(screen_width, screen_height, (0, 0, 0, 128))  # Semi-transparent black
     surface.blit(overlay, (0, 0))
     
-    # Draw game over message
-    game_over_text = BIG_FONT.render('Game Over!', True, WHITE)
-    text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60))
-    surface.blit(game_over_text, text_rect)
-    
-    # Draw final score
-    score_text = FONT.render(f'Final Score: {snake.score}', True, WHITE)
-    score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 10))
-    surface.blit(score_text, score_rect)
-    
-    # Draw time played
-    time_text = FONT.render(f'Time: {int(game_time)}s', True, WHITE)
-    time_rect = time_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
-    surface.blit(time_text, time_rect)
-    
-    # Draw food eaten
-    food_text = FONT.render(
-        f'Food: {snake.regular_food_eaten} regular, {snake.bonus_food_eaten} bonus', 
-        True, WHITE
-    )
-    food_rect = food_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-    surface.blit(food_text, food_rect)
-    
-    # Draw restart instruction
-    restart_text = FONT.render('Press R to restart or M for menu', True, WHITE)
-    restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 90))
-    surface.blit(restart_text, restart_rect)
+    surface.blits(_final_stats_layout(surface, 'Game Over!', WHITE, snake, game_time), False)
 
 def draw_victory(surface, snake, game_time):
     """Draw the victory screen"""
+    screen_width, screen_height = surface.get_size()
     # Draw semi-transparent overlay
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 128))  # Semi-transparent black
+    overlay = sprites.overlay(screen_width, screen_height, (0, 0, 0, 128))  # Semi-transparent black
     surface.blit(overlay, (0, 0))
     
-    # Draw victory message
-    victory_text = BIG_FONT.render('Victory!', True, GOLD)
-    text_rect = victory_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60))
-    surface.blit(victory_text, text_rect)
-    
-    # Draw final score
-    score_text = FONT.render(f'Final Score: {snake.score}', True, WHITE)
-    score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 10))
-    surface.blit(score_text, score_rect)
-    
-    # Draw time played
-    time_text = FONT.render(f'Time: {int(game_time)}s', True, WHITE)
-    time_rect = time_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
-    surface.blit(time_text, time_rect)
-    
-    # Draw food eaten
-    food_text = FONT.render(
-        f'Food: {snake.regular_food_eaten} regular, {snake.bonus_food_eaten} bonus', 
-        True, WHITE
-    )
-    food_rect = food_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-    surface.blit(food_text, food_rect)
-    
-    # Draw restart instruction
-    restart_text = FONT.render('Press R to restart or M for menu', True, WHITE)
-    restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 90))
-    surface.blit(restart_text, restart_rect)
+    surface.blits(_final_stats_layout(surface, 'Victory!', GOLD, snake, game_time), False)
 
 def draw_highscores(surface, highscores, back_button):
     """Draw the high scores screen"""
-    surface.fill(WHITE)
-    
-    # Draw title
-    title_text = BIG_FONT.render('High Scores', True, BLACK)
-    title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 40))
-    surface.blit(title_text, title_rect)
-    
-    # Draw highscore table headers
-    header_y = 100
-    surface.blit(SMALL_FONT.render("Rank", True, BLACK), (20, header_y))
-    surface.blit(SMALL_FONT.render("Name", True, BLACK), (60, header_y))
-    surface.blit(SMALL_FONT.render("Score", True, BLACK), (150, header_y))
-    surface.blit(SMALL_FONT.render("Time", True, BLACK), (210, header_y))
-    surface.blit(SMALL_FONT.render("Food", True, BLACK), (270, header_y))
-    surface.blit(SMALL_FONT.render("Diff", True, BLACK), (330, header_y))
-    
-    # Draw horizontal line
-    pygame.draw.line(surface, BLACK, (20, header_y + 25), (380, header_y + 25), 2)
+    screen_width, screen_height = surface.get_size()
+    rows = tuple(
+        (
+            score['name'][:8],
+            score['score'],
+            int(score['time_played']),
+            score['regular_food'],
+            score['bonus_food'],
+            score['difficulty'][:1]  # Just first letter
+        )
+        for score in highscores
+    )
     
-    # Draw highscores
-    if highscores:
-        for i, score in enumerate(highscores):
-            y = header_y + 35 + i * 25
-            
-            # Rank
-            surface.blit(SMALL_FONT.render(f"{i+1}", True, BLACK), (20, y))
-            
-            # Name
-            surface.blit(SMALL_FONT.render(score['name'][:8], True, BLACK), (60, y))
-            
-            # Score
-            surface.blit(SMALL_FONT.render(f"{score['score']}", True, BLACK), (150, y))
-            
-            # Time
-            surface.blit(SMALL_FONT.render(f"{int(score['time_played'])}s", True, BLACK), (210, y))
-            
-            # Food (regular + bonus)
-            food_text = f"{score['regular_food']}+{score['bonus_food']}"
-            surface.blit(SMALL_FONT.render(food_text, True, BLACK), (270, y))
-            
-            # Difficulty
-            diff_text = score['difficulty'][:1]  # Just first letter
-            surface.blit(SMALL_FONT.render(diff_text, True, BLACK), (330, y))
-    else:
-        no_scores_text = FONT.render("No scores yet!", True, BLACK)
-        no_scores_rect = no_scores_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        surface.blit(no_scores_text, no_scores_rect)
+    def build():
+        table = pygame.Surface((screen_width, screen_height))
+        table.fill(WHITE)
+        
+        # Draw title
+        title_text = render(get_font(BIG_FONT_SIZE), 'High Scores', BLACK)
+        title_rect = title_text.get_rect(center=(screen_width // 2, 40))
+        table.blit(title_text, title_rect)
+        
+        # Draw highscore table headers
+        header_y = 100
+        table.blit(render(get_font(SMALL_FONT_SIZE), "Rank", BLACK), (20, header_y))
+        table.blit(render(get_font(SMALL_FONT_SIZE), "Name", BLACK), (60, header_y))
+        table.blit(render(get_font(SMALL_FONT_SIZE), "Score", BLACK), (150, header_y))
+        table.blit(render(get_font(SMALL_FONT_SIZE), "Time", BLACK), (210, header_y))
+        table.blit(render(get_font(SMALL_FONT_SIZE), "Food", BLACK), (270, header_y))
+        table.blit(render(get_font(SMALL_FONT_SIZE), "Diff", BLACK), (330, header_y))
+        
+        # Draw horizontal line
+        pygame.draw.line(table, BLACK, (20, header_y + 25), (380, header_y + 25), 2)
+        
+        # Draw highscores
+        if rows:
+            for i, (name, score, time_played, regular_food, bonus_food, diff_text) in enumerate(rows):
+                y = header_y + 35 + i * 25
+                
+                # Rank
+                table.blit(render(get_font(SMALL_FONT_SIZE), f"{i+1}", BLACK), (20, y))
+                
+                # Name
+                table.blit(render(get_font(SMALL_FONT_SIZE), name, BLACK), (60, y))
+                
+                # Score
+                table.blit(render(get_font(SMALL_FONT_SIZE), f"{score}", BLACK), (150, y))
+                
+                # Time
+                table.blit(render(get_font(SMALL_FONT_SIZE), f"{time_played}s", BLACK), (210, y))
+                
+                # Food (regular + bonus)
+                food_text = f"{regular_food}+{bonus_food}"
+                table.blit(render(get_font(SMALL_FONT_SIZE), food_text, BLACK), (270, y))
+                
+                # Difficulty
+                table.blit(render(get_font(SMALL_FONT_SIZE), diff_text, BLACK), (330, y))
+        else:
+            no_scores_text = render(get_font(FONT_SIZE), "No scores yet!", BLACK)
+            no_scores_rect = no_scores_text.get_rect(center=(screen_width // 2, screen_height // 2))
+            table.blit(no_scores_text, no_scores_rect)
+        return table
+    
+    surface.blit(_layout('highscores', ((screen_width, screen_height), rows), build), (0, 0))
     
     # Draw back button
     back_button.draw(surface)
+
+def draw_profile(surface, rows):
+    """Draw the profiler overlay table in the top left corner"""
+    font = get_font(PROFILE_FONT_SIZE)
+    # The numbers change every frame, so they bypass the text cache
+    texts = [[font.render(cell, True, WHITE) for cell in row] for row in rows]
+    column_widths = [max(row[i].get_width() for row in texts) for i in range(len(texts[0]))]
+    line_height = font.get_linesize()
+    width = sum(column_widths) + 10 * len(column_widths)
+    height = line_height * len(texts) + 10
+    # The table's size changes with the numbers, so only part of one screen-sized overlay is
+    # blitted, which keeps a single overlay in the sprite cache
+    surface.blit(sprites.overlay(*surface.get_size(), (0, 0, 0, 180)), (0, 0), (0, 0, width, height))
+    
+    y = 5
+    for row in texts:
+        # Name left-aligned, numbers right-aligned in their columns
+        x = 5
+        for i, text in enumerate(row):
+            offset = 0 if i == 0 else column_widths[i] - text.get_width()
+            surface.blit(text, (x + offset, y))
+            x += column_widths[i] + 10
+        y += line_height
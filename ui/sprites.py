@@ -0,0 +1,114 @@
+"""
+Pre-rendered surfaces for the Snake Game board
+
+Everything drawn on the board is built once and then blitted: the
+background with the grid (and a level's walls and obstacles) baked in,
+and one cell-sized sprite per kind of snake segment and food. Sprites are cached by size and color. Cells
+smaller than MIN_DETAIL_SIZE are drawn as plain squares without grid
+lines or borders, which keep large boards readable.
+"""
+import math
+
+import pygame
+from constants import WHITE, BLACK, GRAY, BROWN, MIN_DETAIL_SIZE
+from models.level import WALL
+
+_cache = {}
+
+def _finish(surface, alpha):
+    # Match the display format when there is one, which makes blits cheaper
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha() if alpha else surface.convert()
+    return surface
+
+def background(width, height, grid_size):
+    """White background with the grid lines drawn on it"""
+    key = ('background', width, height, grid_size)
+    surface = _cache.get(key)
+    if surface is None:
+        surface = pygame.Surface((width, height))
+        surface.fill(WHITE)
+        if grid_size >= MIN_DETAIL_SIZE:
+            for x in range(0, width, grid_size):
+                pygame.draw.line(surface, GRAY, (x, 0), (x, height))
+            for y in range(0, height, grid_size):
+                pygame.draw.line(surface, GRAY, (0, y), (width, y))
+        surface = _cache[key] = _finish(surface, False)
+    return surface
+
+def level_background(width, height, grid_size, level):
+    """Background with a level's walls and obstacles drawn on it"""
+    key = ('level_background', width, height, grid_size, level)
+    surface = _cache.get(key)
+    if surface is None:
+        surface = background(width, height, grid_size).copy()
+        wall = _square('wall', grid_size, GRAY)
+        obstacle = _square('obstacle', grid_size, BROWN)
+        surface.blits([
+            (wall if cell_type == WALL else obstacle, (cell % level.width * grid_size, cell // level.width * grid_size))
+            for cell, cell_type in level.iter_blocked()
+        ], False)
+        _cache[key] = surface
+    return surface
+
+def _square(kind, grid_size, color):
+    key = (kind, grid_size, color)
+    surface = _cache.get(key)
+    if surface is None:
+        surface = pygame.Surface((grid_size, grid_size))
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, color, rect)
+        if grid_size >= MIN_DETAIL_SIZE:
+            pygame.draw.rect(surface, BLACK, rect, 1)  # Border
+        surface = _cache[key] = _finish(surface, False)
+    return surface
+
+def snake_body(grid_size, color):
+    return _square('snake_body', grid_size, color)
+
+def snake_head(grid_size, color):
+    return _square('snake_head', grid_size, color)
+
+def regular_food(grid_size, color):
+    return _square('regular_food', grid_size, color)
+
+def bonus_food(grid_size, color):
+    key = ('bonus_food', grid_size, color)
+    surface = _cache.get(key)
+    if surface is None:
+        surface = pygame.Surface((grid_size, grid_size), pygame.SRCALPHA)
+        if grid_size >= MIN_DETAIL_SIZE:
+            half = grid_size // 2
+            draw_star(surface, half, half, half, color)
+        else:
+            surface.fill(color)
+        surface = _cache[key] = _finish(surface, True)
+    return surface
+
+def overlay(width, height, color):
+    """Full-screen surface filled with a (semi-transparent) RGBA color"""
+    key = ('overlay', width, height, color)
+    surface = _cache.get(key)
+    if surface is None:
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill(color)
+        surface = _cache[key] = _finish(surface, True)
+    return surface
+
+def draw_star(surface, x, y, size, color):
+    # Draw a 5-pointed star
+    points = []
+    for i in range(10):
+        # Alternate between outer and inner points
+        angle = math.pi / 5 * i - math.pi / 2
+        radius = size if i % 2 == 0 else size / 2
+        point_x = x + radius * math.cos(angle)
+        point_y = y + radius * math.sin(angle)
+        points.append((point_x, point_y))
+    
+    pygame.draw.polygon(surface, color, points)
+    pygame.draw.polygon(surface, BLACK, points, 1)  # Border
+
+def clear():
+    """Drop all cached surfaces (e.g. after the display mode changed)"""
+    _cache.clear()
@@ -0,0 +1,57 @@
+"""
+Rendered text cache for Snake Game
+
+Font rasterization is expensive, while the labels on screen rarely
+change from one frame to the next. render() keeps the most recently used
+text surfaces in a bounded LRU cache keyed by (font, text, color,
+antialias), so redrawing an unchanged label is a dictionary lookup.
+"""
+from collections import OrderedDict
+
+import pygame
+from constants import FONT_NAME
+
+class TextCache:
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = self._surfaces[key] = font.render(text, antialias, color)
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surface
+    
+    def clear(self):
+        self._surfaces.clear()
+    
+    def __len__(self):
+        return len(self._surfaces)
+
+
+# Shared by all screens
+text_cache = TextCache()
+
+_fonts = {}
+
+def get_font(size, name=FONT_NAME):
+    """Shared font handle, created (with pygame's font module) on first use"""
+    font = _fonts.get((name, size))
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+def render(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
@@ -1,32 +1,152 @@
 """
 High Score Manager for Snake Game
+
+Scores are kept in an append-only JSON Lines log: adding a score writes a
+single line, and a crash can at worst leave a torn last line, which is
+skipped on load. The full history stays on disk, while memory only holds
+bounded top-K heaps for the overall and per-difficulty leaderboards. Each
+board size and mode (see Board.key) has leaderboards of its own; entries
+from before boards were recorded count as the default board's.
+
+With a BackgroundWriter, new scores go into the heaps at once and reach
+the log later, so get_highscores() already includes them while the game
+loop never waits for the disk.
 """
+import heapq
 import json
 import os
 import time
-from constants import HIGHSCORE_FILE
+from constants import HIGHSCORE_FILE, HIGHSCORE_LOG, HIGHSCORE_LIMIT
+from models.board import DEFAULT_BOARD
+
+def _is_number(value):
+    """An int or float (bools are ints to Python, but not scores)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_entry(entry):
+    """Whether a parsed entry has the fields the leaderboards sort and group by, of the right types"""
+    return (
+        isinstance(entry, dict)
+        and _is_number(entry.get('score'))
+        and _is_number(entry.get('time_played', 0))
+        and isinstance(entry.get('difficulty', ''), str)
+        and isinstance(entry.get('board', ''), str)
+    )
 
 class HighScoreManager:
-    def __init__(self, filename=HIGHSCORE_FILE):
+    def __init__(self, filename=HIGHSCORE_LOG, max_scores=HIGHSCORE_LIMIT, legacy_filename=HIGHSCORE_FILE,
+                 writer=None):
         self.filename = filename
-        self.highscores = []
+        self.writer = writer  # Appends to the log go through this BackgroundWriter when set
+        self.max_scores = max_scores
+        self.legacy_filename = legacy_filename
         self.load_highscores()
     
     def load_highscores(self):
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r') as f:
-                    self.highscores = json.load(f)
-            except:
-                self.highscores = []
-        else:
-            self.highscores = []
+        self._heaps = {}  # (board key, difficulty name or None for overall) -> top-K heap
+        self._sorted = {}
+        self._count = 0
+        self.corrupt_lines = 0
+        
+        if not os.path.exists(self.filename):
+            self._import_legacy()
+            return
+        
+        for entry in self._read_log():
+            self._remember(entry)
+        
+        # Rewrite the log without the damaged lines so they are not re-read forever
+        if self.corrupt_lines:
+            self.compact()
+    
+    def _read_log(self):
+        """Yield the valid entries of the log, counting lines that cannot be parsed or are not score entries"""
+        try:
+            with open(self.filename, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        self.corrupt_lines += 1
+                        continue
+                    if _is_entry(entry):
+                        yield entry
+                    else:
+                        self.corrupt_lines += 1
+        except OSError:
+            return
+    
+    def _import_legacy(self):
+        """Carry scores over from the old single-file highscores.json"""
+        if not self.legacy_filename or not os.path.exists(self.legacy_filename):
+            return
+        try:
+            with open(self.legacy_filename, 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(entries, list):
+            return
+        
+        entries = [entry for entry in entries if _is_entry(entry)]
+        for entry in entries:
+            self._remember(entry)
+        self._write_atomic(entries)
+    
+    def _remember(self, entry):
+        """Add an entry to the in-memory top-K heaps"""
+        self._count += 1
+        # Higher score wins, then shorter time, then the earlier entry
+        item = (entry['score'], -entry.get('time_played', 0), -self._count, entry)
+        board = entry.get('board', DEFAULT_BOARD.key)
+        difficulty = entry.get('difficulty')
+        for difficulty in (None,) if difficulty is None else (None, difficulty):
+            heap = self._heaps.setdefault((board, difficulty), [])
+            if len(heap) < self.max_scores:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        self._sorted.clear()
     
     def save_highscores(self):
-        with open(self.filename, 'w') as f:
-            json.dump(self.highscores, f)
+        """Compact the log; kept for callers of the old API"""
+        self.compact()
+    
+    def compact(self):
+        """Atomically rewrite the log, dropping lines that could not be parsed or were not score entries"""
+        if self.writer is not None:
+            self.writer.flush()
+        if not os.path.exists(self.filename):
+            return
+        self.corrupt_lines = 0
+        self._write_atomic(list(self._read_log()))
+    
+    def _write_atomic(self, entries):
+        # Write to a temporary file and rename it over the log, so readers
+        # see either the old or the new file, never a partial one
+        temp_filename = self.filename + '.tmp'
+        with open(temp_filename, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, self.filename)
     
-    def add_score(self, name, score, time_played, regular_food, bonus_food, difficulty):
+    def append(self, entry):
+        """Record a score entry in memory and append it to the log"""
+        self._remember(entry)
+        line = json.dumps(entry) + '\n'
+        if self.writer is not None:
+            self.writer.append(self.filename, line)
+            return
+        with open(self.filename, 'a') as f:
+            f.write(line)
+    
+    def add_score(self, name, score, time_played, regular_food, bonus_food, difficulty, replay=None,
+                  board=DEFAULT_BOARD.key):
         new_score = {
             'name': name,
             'score': score,
@@ -34,19 +154,22 @@ class HighScoreManager:
             'regular_food': regular_food,
             'bonus_food': bonus_food,
             'difficulty': difficulty,
+            'board': board,  # Board.key of the board played on
             'timestamp': time.time()
         }
-        
-        self.highscores.append(new_score)
-        
-        # Sort by score (descending) and time (ascending)
-        self.highscores.sort(key=lambda x: (-x['score'], x['time_played']))
-        
-        # Keep only top 10 scores
-        if len(self.highscores) > 10:
-            self.highscores = self.highscores[:10]
-        
-        self.save_highscores()
+        if replay is not None:
+            new_score['replay'] = replay  # Replay file the score can be re-verified from
+        self.append(new_score)
+        return new_score
+    
+    def get_highscores(self, difficulty=None, board=DEFAULT_BOARD.key):
+        """Top scores on one board (a Board.key), best first, overall or for one difficulty name"""
+        key = (board, difficulty)
+        scores = self._sorted.get(key)
+        if scores is None:
+            scores = self._sorted[key] = [item[3] for item in sorted(self._heaps.get(key, []), reverse=True)]
+        return scores
     
-    def get_highscores(self):
-        return self.highscores
+    def __len__(self):
+        """Number of scores in the history"""
+        return self._count
@@ -0,0 +1,159 @@
+"""
+Frame-time profiler for Snake Game
+
+Profiler.instrument() wraps the methods of an object (the game's
+handle_events, update, draw_* and present) with timers that record each
+call's duration into a fixed-size ring buffer per phase. Nothing is
+wrapped unless profiling is enabled, so a normal run pays nothing.
+Percentiles are only computed when a summary is asked for: by the
+on-screen overlay, or by the periodic JSON/CSV dump.
+"""
+import csv
+import json
+import os
+import time
+from array import array
+
+from constants import PROFILE_SAMPLES, PROFILE_DUMP_INTERVAL
+
+class RingBuffer:
+    """The most recent `size` float samples"""
+    
+    def __init__(self, size=PROFILE_SAMPLES):
+        self._samples = array('d', bytes(8 * size))
+        self._next = 0
+        self.count = 0  # Samples recorded in total, including overwritten ones
+    
+    def append(self, value):
+        self._samples[self._next] = value
+        self._next = (self._next + 1) % len(self._samples)
+        self.count += 1
+    
+    def values(self):
+        return self._samples[:min(self.count, len(self._samples))]
+    
+    def __len__(self):
+        return min(self.count, len(self._samples))
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class Profiler:
+    def __init__(self, output=None, overlay=False, size=PROFILE_SAMPLES,
+                 dump_interval=PROFILE_DUMP_INTERVAL):
+        self.output = output
+        self.overlay = overlay
+        self.size = size
+        self.dump_interval = dump_interval
+        self.phases = {}
+        self.counters = {}
+        self._last_dump = time.perf_counter()
+    
+    @classmethod
+    def from_settings(cls, enabled=False, overlay=False, output=None, environ=os.environ):
+        """Build a profiler from CLI flags, falling back to environment variables.
+        
+        SNAKE_PROFILE=1 turns profiling on, SNAKE_PROFILE_OVERLAY=1 adds the
+        on-screen overlay and SNAKE_PROFILE_OUT names the dump file (.csv
+        for CSV, anything else for JSON). Asking for an overlay or a dump
+        file implies profiling. Returns None when profiling is off.
+        """
+        overlay = overlay or environ.get('SNAKE_PROFILE_OVERLAY', '0') not in ('', '0')
+        output = output or environ.get('SNAKE_PROFILE_OUT') or None
+        enabled = enabled or environ.get('SNAKE_PROFILE', '0') not in ('', '0')
+        if not (enabled or overlay or output):
+            return None
+        return cls(output, overlay)
+    
+    def phase(self, name):
+        """Ring buffer of durations for a phase, created on first use"""
+        samples = self.phases.get(name)
+        if samples is None:
+            samples = self.phases[name] = RingBuffer(self.size)
+        return samples
+    
+    def instrument(self, obj, names):
+        """Replace each named method of obj with a version that records its duration"""
+        for name in names:
+            setattr(obj, name, self._timed(name, getattr(obj, name)))
+    
+    def _timed(self, name, method):
+        samples = self.phase(name)
+        clock = time.perf_counter
+        
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                samples.append(clock() - start)
+        return timed
+    
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def summary(self):
+        """Per-phase statistics in milliseconds, plus the counters"""
+        phases = {}
+        for name, samples in self.phases.items():
+            if not len(samples):
+                continue
+            values = sorted(samples.values())
+            phases[name] = {
+                'calls': samples.count,
+                'mean_ms': sum(values) / len(values) * 1000,
+                'p50_ms': percentile(values, 0.50) * 1000,
+                'p95_ms': percentile(values, 0.95) * 1000,
+                'p99_ms': percentile(values, 0.99) * 1000,
+                'max_ms': values[-1] * 1000,
+            }
+        return {'timestamp': time.time(), 'phases': phases, 'counters': dict(self.counters)}
+    
+    def overlay_rows(self):
+        """Table rows of text for the on-screen overlay, header first"""
+        summary = self.summary()
+        rows = [('ms', 'p50', 'p95', 'p99')]
+        for name, stats in sorted(summary['phases'].items()):
+            rows.append((name, f"{stats['p50_ms']:.2f}", f"{stats['p95_ms']:.2f}", f"{stats['p99_ms']:.2f}"))
+        for name, value in sorted(summary['counters'].items()):
+            rows.append((name, str(value), '', ''))
+        return rows
+    
+    def maybe_dump(self):
+        """Dump the summary if an output file is set and the dump interval has passed"""
+        if self.output is None:
+            return
+        now = time.perf_counter()
+        if now - self._last_dump >= self.dump_interval:
+            self._last_dump = now
+            self.dump()
+    
+    def dump(self):
+        """Write the summary: CSV files get one row per phase appended, JSON is rewritten"""
+        if self.output is None:
+            return
+        summary = self.summary()
+        if self.output.endswith('.csv'):
+            new_file = not os.path.exists(self.output)
+            with open(self.output, 'a', newline='') as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(['timestamp', 'phase', 'calls', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+                for name, stats in sorted(summary['phases'].items()):
+                    writer.writerow([
+                        f"{summary['timestamp']:.3f}", name, stats['calls'],
+                        *(f"{stats[key]:.4f}" for key in ('mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'))
+                    ])
+                for name, value in sorted(summary['counters'].items()):
+                    writer.writerow([f"{summary['timestamp']:.3f}", name, value, '', '', '', '', ''])
+        else:
+            temp_filename = self.output + '.tmp'
+            with open(temp_filename, 'w') as f:
+                json.dump(summary, f, indent=2)
+            os.replace(temp_filename, self.output)
@@ -0,0 +1,158 @@
+"""
+Replay recording and playback for Snake Game
+
+A game is fully determined by its seed and the direction the snake moved
+on each tick, so that is all a replay stores: a fixed header (seed,
+difficulty, board size and mode, tick count) followed by the direction
+stream, run-length encoded. Each run is one varint holding
+(length << 2) | direction, so a straight run of up to 31 ticks costs a
+single byte.
+"""
+import struct
+
+from models.board import Board
+from models.core import GameCore
+from models.enums import Difficulty, Direction
+
+MAGIC = b'SNKR'
+VERSION = 2
+
+# magic, version, difficulty, width, height, seed, ticks, flags, level digest (zeros without a level)
+_HEADER = struct.Struct('<4sBBHHQIB8s')
+_HEADER_V1 = struct.Struct('<4sBBHHQI')  # Plain boards only
+
+# Header flags
+WRAP = 1
+_NO_LEVEL = bytes(8)
+
+# 2-bit direction codes
+_DIRECTIONS = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+_CODES = {direction: code for code, direction in enumerate(_DIRECTIONS)}
+
+class Replay:
+    def __init__(self, seed, width, height, difficulty=Difficulty.NORMAL, wrap=False, level_digest=None):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.difficulty = difficulty
+        self.wrap = wrap
+        self.level_digest = level_digest  # Level.digest of the level played on, or None
+        self.runs = []  # [direction code, length] pairs
+        self.ticks = 0
+    
+    @classmethod
+    def for_core(cls, core, difficulty=Difficulty.NORMAL):
+        """Empty replay for the game a GameCore is about to play"""
+        board = core.board
+        return cls(core.seed, board.width, board.height, difficulty, board.wrap, board.level_digest)
+    
+    def __len__(self):
+        return self.ticks
+    
+    def record(self, direction):
+        """Append the direction the snake moved in on one tick"""
+        code = _CODES[direction]
+        runs = self.runs
+        if runs and runs[-1][0] == code:
+            runs[-1][1] += 1
+        else:
+            runs.append([code, 1])
+        self.ticks += 1
+    
+    def __iter__(self):
+        """Iterate over the recorded directions, one per tick"""
+        for code, length in self.runs:
+            direction = _DIRECTIONS[code]
+            for _ in range(length):
+                yield direction
+    
+    def to_bytes(self):
+        data = bytearray(_HEADER.pack(
+            MAGIC, VERSION, self.difficulty.value, self.width, self.height, self.seed, self.ticks,
+            WRAP if self.wrap else 0, self.level_digest or _NO_LEVEL
+        ))
+        for code, length in self.runs:
+            value = length << 2 | code
+            while value >= 0x80:
+                data.append(value & 0x7f | 0x80)
+                value >>= 7
+            data.append(value)
+        return bytes(data)
+    
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < _HEADER_V1.size:
+            raise ValueError("Replay is truncated")
+        magic, version, difficulty, width, height, seed, ticks = _HEADER_V1.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a replay file")
+        if version == 1:
+            header_size, flags, level_digest = _HEADER_V1.size, 0, _NO_LEVEL
+        elif version == VERSION:
+            if len(data) < _HEADER.size:
+                raise ValueError("Replay is truncated")
+            header_size = _HEADER.size
+            flags, level_digest = _HEADER.unpack_from(data)[-2:]
+        else:
+            raise ValueError(f"Unsupported replay version {version}")
+        
+        replay = cls(seed, width, height, Difficulty(difficulty), bool(flags & WRAP),
+                     None if level_digest == _NO_LEVEL else level_digest)
+        value = shift = 0
+        for byte in data[header_size:]:
+            value |= (byte & 0x7f) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            replay.runs.append([value & 3, value >> 2])
+            replay.ticks += value >> 2
+            value = shift = 0
+        
+        if shift or replay.ticks != ticks:
+            raise ValueError("Replay is truncated")
+        return replay
+    
+    def save(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(self.to_bytes())
+    
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayPlayer:
+    """Re-simulates a replay on its own GameCore, one tick at a time or all at once"""
+    
+    def __init__(self, replay, board=None):
+        """board must match the one the replay was recorded on; it is only optional without a level"""
+        if board is None:
+            if replay.level_digest is not None:
+                raise ValueError("Replay is for a level, which has to be given")
+            board = Board(replay.width, replay.height, 0, replay.wrap)
+        else:
+            board.check(replay.width, replay.height, replay.wrap, replay.level_digest, "Replay")
+        self.replay = replay
+        self.core = GameCore(board, replay.seed)
+        self._directions = iter(replay)
+    
+    @property
+    def finished(self):
+        return self.core.is_over or self.core.ticks >= len(self.replay)
+    
+    def step(self):
+        """Play the next recorded tick and return its GameEvents"""
+        direction = next(self._directions, None)
+        if direction is None:
+            return []
+        return self.core.step(direction)
+    
+    def run(self):
+        """Play the rest of the replay at full speed and return the final GameCore"""
+        step = self.core.step
+        for direction in self._directions:
+            step(direction)
+            if self.core.is_over:
+                break
+        return self.core
@@ -0,0 +1,92 @@
+"""
+Background file writer for Snake Game
+
+The game loop hands finished scores and replays to a BackgroundWriter,
+which writes them on its own thread, so a slow disk never delays a frame.
+Requests wait in a bounded queue. The thread takes everything queued at
+once and appends each file's lines with a single write, so a burst of
+scores costs one open per file. flush() waits until everything queued
+has been written; close() also stops the thread. Relative file names
+are resolved when a write is queued, not when it is done.
+"""
+import os
+import queue
+import threading
+
+from constants import WRITE_QUEUE_SIZE
+
+_APPEND = 'append'
+_WRITE = 'write'
+
+class BackgroundWriter:
+    def __init__(self, maxsize=WRITE_QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize)
+        self.failures = 0  # Writes that raised OSError; there is no caller left to tell
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='snake-writer', daemon=True)
+        self._thread.start()
+    
+    def append(self, filename, text):
+        """Queue text to be appended to a file"""
+        self._queue.put((_APPEND, os.path.abspath(filename), text))
+    
+    def write(self, filename, data):
+        """Queue bytes to replace a file's contents, creating its directory if needed"""
+        self._queue.put((_WRITE, os.path.abspath(filename), data))
+    
+    def flush(self):
+        """Block until every queued write has been done"""
+        self._queue.join()
+    
+    def close(self):
+        """Flush and stop the thread; safe to call more than once"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            appends = {}
+            for request in batch:
+                if request is None:
+                    continue
+                kind, filename, data = request
+                if kind == _APPEND:
+                    appends.setdefault(filename, []).append(data)
+                else:
+                    self._guarded(self._write, filename, data)
+            for filename, texts in appends.items():
+                self._guarded(self._append, filename, ''.join(texts))
+            
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+    
+    def _guarded(self, write, filename, data):
+        try:
+            write(filename, data)
+        except OSError:
+            self.failures += 1
+    
+    @staticmethod
+    def _append(filename, text):
+        with open(filename, 'a') as f:
+            f.write(text)
+    
+    @staticmethod
+    def _write(filename, data):
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, 'wb') as f:
+            f.write(data)